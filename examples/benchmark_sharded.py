@@ -0,0 +1,144 @@
+import sys
+import os
+
+import threading  # Import the threading module for the worker threads
+import time  # Import the time module for measuring the throughput
+
+# Add the src directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from Sharded_FIFO_Dynamic_Prio import Sharded_FIFO_Dynamic_Prio
+
+
+class TimedLock():
+        """
+        A lock that counts its acquisitions and measures how long threads waited for it.
+        The counters are only updated while the lock is held.
+        """
+
+        def __init__(self):
+            self._lock = threading.Lock()
+            self.acquisitions = 0
+            self.contended = 0
+            self.wait = 0.0
+
+        def __enter__(self):
+            # Only acquisitions that cannot succeed immediately are contended.
+            if not self._lock.acquire(blocking=False):
+                start = time.perf_counter()
+                self._lock.acquire()
+                self.wait += time.perf_counter() - start
+                self.contended += 1
+            self.acquisitions += 1
+
+        def __exit__(self, *exc_info):
+            self._lock.release()
+
+
+def instrumented_queue(capacity, shards, relaxed=False):
+        """
+        Creates a sharded queue whose shard and merge locks are TimedLocks.
+
+        Objects are (worker, index) tuples and are sharded by worker, so with one shard
+        per worker every producer works on its own shard.
+
+        Args:
+        - capacity: The maximum number of elements per shard.
+        - shards: The number of shards.
+        - relaxed: Whether the queue uses the relaxed serving mode.
+
+        Returns:
+        - result: Instance of the Sharded_FIFO_Dynamic_Prio class.
+        """
+
+        fifo = Sharded_FIFO_Dynamic_Prio(capacity, shards=shards, relaxed=relaxed, key=lambda object: object[0])
+        fifo._shard_lock = [TimedLock() for _ in range(fifo.shards)]
+        fifo._merge_lock = TimedLock()
+        return fifo
+
+
+def run_workers(fifo, worker_cnt, ops_per_worker, backlog, serve):
+        """
+        Runs worker threads that enqueue, prioritise and optionally serve objects on a shared queue.
+
+        Every worker dequeues its own object from backlog rounds earlier, so each worker
+        keeps at most backlog objects queued. The total number of queued objects is thus
+        the same for every queue configuration, and short queues keep the linear scans of
+        FIFO_Dynamic_Prio from dominating the lock measurements.
+
+        Args:
+        - fifo: Instance of the Sharded_FIFO_Dynamic_Prio class with TimedLocks.
+        - worker_cnt: The number of worker threads.
+        - ops_per_worker: The number of enqueue/prioritise/serve rounds per worker.
+        - backlog: The maximum number of objects each worker keeps queued.
+        - serve: Whether the workers also serve objects (otherwise they only produce).
+
+        Returns:
+        - result: A tuple (operations per second, share of contended shard-lock
+          acquisitions, total shard-lock wait in ms, share of contended merge-lock
+          acquisitions, total merge-lock wait in ms).
+        """
+
+        ops = [0] * worker_cnt
+
+        def work(worker):
+            worker_ops = 0
+            for i in range(ops_per_worker):
+                object = (worker, i)
+                fifo.enqueue_object(object)
+                worker_ops += 1
+                if i % 4 == 0:
+                    fifo.prioritise_object(object, i % 9 + 1)
+                    worker_ops += 1
+                if i >= backlog:
+                    fifo.dequeue_object((worker, i - backlog))
+                    worker_ops += 1
+                if serve and i % 2 == 1:
+                    fifo.serve()
+                    worker_ops += 1
+            ops[worker] = worker_ops
+
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(worker_cnt)]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+
+        shard_acquisitions = sum(lock.acquisitions for lock in fifo._shard_lock)
+        shard_contended = sum(lock.contended for lock in fifo._shard_lock)
+        shard_wait = sum(lock.wait for lock in fifo._shard_lock)
+        merge_lock = fifo._merge_lock
+
+        return (sum(ops) / elapsed,
+                shard_contended / max(1, shard_acquisitions), shard_wait * 1000,
+                merge_lock.contended / max(1, merge_lock.acquisitions), merge_lock.wait * 1000)
+
+
+if __name__ == "__main__":
+
+    ops_per_worker = 2000  # Number of rounds per worker thread
+    backlog = 32  # Maximum number of objects each worker keeps queued
+    max_workers = os.cpu_count() or 1  # Scale up to the number of available cores
+
+    # Note: In CPython the GIL serialises pure Python code, so threads cannot show a
+    # multi-core speed-up. What sharding changes is lock contention, which is measured
+    # directly: the share of lock acquisitions that had to wait and the total wait time.
+    print("workload  workers  queue            ops/s  shard contended  shard wait [ms]  merge contended  merge wait [ms]")
+
+    for serve in (False, True):
+        workload = "mixed" if serve else "produce"
+        worker_cnt = 1
+        while worker_cnt <= max_workers:
+            # Every configuration holds at most backlog objects per worker in total.
+            capacity = worker_cnt * backlog
+            for name, shards, relaxed in (("single lock", 1, False), ("sharded strict", worker_cnt, False), ("sharded relaxed", worker_cnt, True)):
+                fifo = instrumented_queue(capacity, shards, relaxed)
+                ops, shard_share, shard_wait, merge_share, merge_wait = run_workers(fifo, worker_cnt, ops_per_worker, backlog, serve)
+                print(f"{workload:8s}  {worker_cnt:7d}  {name:15s}  {ops:6.0f}  {shard_share:15.1%}  {shard_wait:15.1f}  {merge_share:15.1%}  {merge_wait:15.1f}")
+            worker_cnt *= 2
+
+    print("Done!")  # Confirmation of completed benchmark.
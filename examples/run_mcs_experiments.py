@@ -0,0 +1,232 @@
+import sys
+import os
+
+import argparse  # Import the argparse module for the command line interface
+import concurrent.futures  # Import the concurrent.futures module for the process pool
+import itertools  # Import the itertools module for building the parameter sweep
+import random  # Import the random module for generating randomness
+
+# Add the src directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from FIFO_Dynamic_Prio import FIFO_Dynamic_Prio
+
+
+# Priority distributions a machine's priority is drawn from once it is prioritised.
+# Each entry maps a name to (probability of being prioritised, {priority: weight}).
+PRIO_DISTRIBUTIONS = {
+    "none": (0.0, {}),
+    "uniform": (0.5, {prio: 1 for prio in range(1, 10)}),
+    "skewed": (0.2, {1: 8, 2: 4, 3: 2, 9: 1}),
+}
+
+
+def empty_summary():
+        """
+        Returns an empty summary, the neutral element of merge_summaries.
+
+        Returns:
+        - result: A summary with zero runs.
+        """
+
+        return {"runs": 0, "served": 0, "starved": 0, "starved_unserved": 0, "waits": {}, "queue_lengths": {}}
+
+
+def simulate(config):
+        """
+        Runs one seeded simulation trajectory of machines queueing for a single server.
+
+        In every step each machine that is not queued enqueues with probability
+        arrival_rate and is then prioritised according to the priority distribution.
+        Afterwards the server serves the next object with probability service_rate.
+
+        Args:
+        - config: A tuple (machines, prio_distribution, arrival_rate, service_rate,
+          steps, starvation_limit, seed).
+
+        Returns:
+        - result: A tuple (config key, summary), where the summary holds compact
+          statistics: served count, starvation count of served machines, count of
+          machines still queued beyond the starvation limit at the end of the run,
+          wait-time histograms per priority ({priority: {wait: count}}) and the
+          queue-length histogram ({length: steps}).
+        """
+
+        machines, prio_distribution, arrival_rate, service_rate, steps, starvation_limit, seed = config
+        rng = random.Random(seed)
+
+        prio_probability, prio_weights = PRIO_DISTRIBUTIONS[prio_distribution]
+        prio_values = list(prio_weights)
+        prio_cum_weights = list(itertools.accumulate(prio_weights.values()))
+
+        fifo = FIFO_Dynamic_Prio(machines)
+        enqueued_at = {}  # Step at which each queued machine was enqueued
+        prio_of = {}  # Priority of each prioritised machine
+
+        summary = empty_summary()
+        summary["runs"] = 1
+
+        for step in range(steps):
+            # Arrivals
+            for i in range(1, machines + 1):
+                machine = f"MC{i}"
+                if machine not in enqueued_at and rng.random() < arrival_rate:
+                    fifo.enqueue_object(machine)
+                    enqueued_at[machine] = step
+                    if prio_values and rng.random() < prio_probability:
+                        prio = rng.choices(prio_values, cum_weights=prio_cum_weights)[0]
+                        fifo.prioritise_object(machine, prio)
+                        prio_of[machine] = prio
+
+            # Service
+            if enqueued_at and rng.random() < service_rate:
+                machine = fifo.serve()
+                wait = step - enqueued_at.pop(machine)
+                waits = summary["waits"].setdefault(prio_of.pop(machine, 0), {})
+                waits[wait] = waits.get(wait, 0) + 1
+                summary["served"] += 1
+                if wait > starvation_limit:
+                    summary["starved"] += 1
+
+            # Queue length after this step
+            length = len(enqueued_at)
+            summary["queue_lengths"][length] = summary["queue_lengths"].get(length, 0) + 1
+
+        # Machines still waiting beyond the limit when the run ends are starving too.
+        summary["starved_unserved"] = sum(1 for enqueued in enqueued_at.values() if steps - enqueued > starvation_limit)
+
+        return (config[:4], summary)
+
+
+def merge_summaries(target, summary):
+        """
+        Merges the summary of one run into the accumulated summary of its configuration.
+
+        Args:
+        - target: The accumulated summary, updated in place.
+        - summary: The summary of a single run.
+        """
+
+        target["runs"] += summary["runs"]
+        target["served"] += summary["served"]
+        target["starved"] += summary["starved"]
+        target["starved_unserved"] += summary["starved_unserved"]
+
+        for prio, waits in summary["waits"].items():
+            target_waits = target["waits"].setdefault(prio, {})
+            for wait, count in waits.items():
+                target_waits[wait] = target_waits.get(wait, 0) + count
+
+        for length, count in summary["queue_lengths"].items():
+            target["queue_lengths"][length] = target["queue_lengths"].get(length, 0) + count
+
+
+def quantiles(histogram, fractions):
+        """
+        Returns the quantiles of a histogram.
+
+        Args:
+        - histogram: A dictionary {value: count}.
+        - fractions: The quantiles to compute, e.g. [0.5, 0.9, 0.99].
+
+        Returns:
+        - result: A list with the smallest value whose cumulative share reaches each
+          fraction, or None for every fraction if the histogram is empty.
+        """
+
+        total = sum(histogram.values())
+        if total == 0:
+            return [None for fraction in fractions]
+
+        result = []
+        for fraction in fractions:
+            cumulative = 0
+            for value in sorted(histogram):
+                cumulative += histogram[value]
+                if cumulative >= fraction * total:
+                    result.append(value)
+                    break
+        return result
+
+
+def format_report(results):
+        """
+        Formats the merged summaries of all configurations as a text report.
+
+        Args:
+        - results: A dictionary {config key: merged summary}.
+
+        Returns:
+        - result: The report as a string.
+        """
+
+        lines = []
+        for (machines, prio_distribution, arrival_rate, service_rate), summary in sorted(results.items()):
+            lines.append(f"machines={machines} prio={prio_distribution} arrival={arrival_rate} service={service_rate}"
+                         f" runs={summary['runs']} served={summary['served']} starved={summary['starved']}"
+                         f" starved_unserved={summary['starved_unserved']}")
+
+            # Wait-time quantiles, highest priority first (0 = not prioritised)
+            for prio in sorted(summary["waits"], reverse=True):
+                p50, p90, p99 = quantiles(summary["waits"][prio], [0.5, 0.9, 0.99])
+                count = sum(summary["waits"][prio].values())
+                lines.append(f"    prio {prio}: n={count} wait p50={p50} p90={p90} p99={p99}")
+
+            # Queue-length histogram as shares of all simulated steps
+            total = sum(summary["queue_lengths"].values())
+            shares = ", ".join(f"{length}: {count / total:.3f}" for length, count in sorted(summary["queue_lengths"].items()))
+            lines.append(f"    queue length: {{{shares}}}")
+
+        return "\n".join(lines)
+
+
+def run_experiments(machines, prio_distributions, arrival_rates, service_rates, runs, steps, starvation_limit, seed, workers):
+        """
+        Fans out independent seeded simulations over a process pool and merges their summaries.
+
+        Args:
+        - machines, prio_distributions, arrival_rates, service_rates: The values to sweep over.
+        - runs: The number of seeded runs per configuration.
+        - steps: The number of simulated steps per run.
+        - starvation_limit: The wait (in steps) above which a served machine counts as starved.
+        - seed: The base seed; every run gets its own seed derived from it, its
+          configuration and its run index, so extending the sweep does not change
+          the runs of the other configurations.
+        - workers: The number of worker processes (None = number of cores).
+
+        Returns:
+        - result: A dictionary {config key: merged summary}.
+        """
+
+        grid = itertools.product(machines, prio_distributions, arrival_rates, service_rates, range(runs))
+        configs = [(m, p, a, s, steps, starvation_limit, random.Random(f"{seed}:{m}:{p}:{a}:{s}:{run}").getrandbits(64))
+                   for m, p, a, s, run in grid]
+
+        results = {}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(configs) // (4 * (workers or os.cpu_count() or 1)))
+            for key, summary in executor.map(simulate, configs, chunksize=chunksize):
+                merge_summaries(results.setdefault(key, empty_summary()), summary)
+
+        return results
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Parallel Monte Carlo what-if studies for FIFO_Dynamic_Prio.")
+    parser.add_argument("--machines", type=int, nargs="+", default=[5, 10, 20], help="Machine counts to sweep over")
+    parser.add_argument("--prio", nargs="+", default=list(PRIO_DISTRIBUTIONS), choices=list(PRIO_DISTRIBUTIONS), help="Priority distributions to sweep over")
+    parser.add_argument("--arrival-rates", type=float, nargs="+", default=[0.05, 0.1], help="Per-step arrival probabilities of an idle machine")
+    parser.add_argument("--service-rates", type=float, nargs="+", default=[0.5, 0.9], help="Per-step service probabilities")
+    parser.add_argument("--runs", type=int, default=8, help="Seeded runs per configuration")
+    parser.add_argument("--steps", type=int, default=10000, help="Simulated steps per run")
+    parser.add_argument("--starvation-limit", type=int, default=100, help="Wait in steps above which a machine counts as starved")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed of the runs")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of cores)")
+    args = parser.parse_args()
+
+    results = run_experiments(args.machines, args.prio, args.arrival_rates, args.service_rates,
+                              args.runs, args.steps, args.starvation_limit, args.seed, args.workers)
+
+    print(format_report(results))
+    print(f"Done! - {sum(summary['runs'] for summary in results.values())} runs have been simulated.")  # Confirmation of completed experiments.
@@ -1,3 +1,7 @@
+import bisect
+import time
+
+
 class FIFO_Dynamic_Prio():
     """
     A class that implements a FIFO (First In, First Out) queue with dynamic prioritization.
@@ -8,7 +12,7 @@ class FIFO_Dynamic_Prio():
     implementation, particularly in low-level programming environments.
     """
 
-    def __init__(self, n):
+    def __init__(self, n, serve_rate_smoothing=0.2):
         """
         Initializes the FIFO_Dynamic_Prio object.
 
@@ -17,6 +21,9 @@ class FIFO_Dynamic_Prio():
         n : int
             The maximum number of elements that the queue, heap, and other internal
             structures will hold.
+        serve_rate_smoothing : float, optional
+            The weight of the latest interval between two serves in the moving average
+            used by estimated_wait(). Default is 0.2.
         """
         
         # The maximum number of elements (n) for the queue
@@ -49,6 +56,30 @@ class FIFO_Dynamic_Prio():
 
         # The index in _recursive_calls_stack where the next element will be inserted.
         self._recursive_calls_stack_next_index = 1
+
+        # The enqueue sequence number of every queued object and the sequence number
+        # that will be given to the next enqueued object.
+        self._rank_seq = {}
+        self._rank_next_seq = 1
+
+        # The priority of every object prioritised with a priority other than 0.
+        self._rank_prio = {}
+
+        # Order-statistic structures kept alongside the heap: the sorted
+        # (-priority, sequence number) keys of the prioritised objects and the sorted
+        # sequence numbers of the unprioritised objects. Together they describe the
+        # service order, so the rank of an object is found by binary search.
+        self._rank_heap_keys = []
+        self._rank_fifo_keys = []
+
+        # The weight of the latest serve interval in the moving average.
+        self.serve_rate_smoothing = serve_rate_smoothing
+
+        # The time of the last serve and the moving average of the interval between
+        # two serves (0 until two serves have been observed).
+        self._clock = time.monotonic
+        self._last_serve_time = 0
+        self._serve_interval = 0
     
     def __str__(self):
         """
@@ -87,6 +118,7 @@ class FIFO_Dynamic_Prio():
         """
         Adds an object to the queue. 
         Note: The prioritization of the object must be set separately after enqueuing.
+        An object that is already in the queue is not added a second time.
 
         Parameters:
         ----------
@@ -94,6 +126,10 @@ class FIFO_Dynamic_Prio():
             The object to be added to the queue and tracked.
         """
         
+        # Objects are identified by value, so every object can be queued only once.
+        if object in self._rank_seq:
+            return
+
         if self._queue_next_index < self.n:
 
             # Adds the object to the next available position in the queue.
@@ -108,6 +144,11 @@ class FIFO_Dynamic_Prio():
             # Increment the index for not_in_heap to point to the next position where a new element can be added.
             self._not_in_heap_next_index += 1
 
+            # Track the object at the end of the service order of unprioritised objects.
+            self._rank_seq[object] = self._rank_next_seq
+            self._rank_fifo_keys.append(self._rank_next_seq)
+            self._rank_next_seq += 1
+
     def next_serve(self):
         """
         Returns a tuple indicating if the next object can be served and the object itself.
@@ -157,6 +198,16 @@ class FIFO_Dynamic_Prio():
         # If there is a valid object, dequeue it from the queue.
         if valid:
             self.dequeue_object(next_object)  # Remove the object from the queue.
+
+            # Update the moving average of the interval between two serves.
+            now = self._clock()
+            if self._last_serve_time:
+                interval = now - self._last_serve_time
+                if self._serve_interval:
+                    self._serve_interval += self.serve_rate_smoothing * (interval - self._serve_interval)
+                else:
+                    self._serve_interval = interval
+            self._last_serve_time = now
         
         return next_object  # Return the served object (or None if there was no object).
 
@@ -217,6 +268,10 @@ class FIFO_Dynamic_Prio():
                             self._heap_remove(i)  # Remove the object from the heap.
                             break
 
+                # Stop tracking the rank of the object.
+                self._rank_remove(object)
+                self._rank_seq.pop(object, None)
+
                 # If the object was in the queue, adjust heap indices for remaining objects.
                 if queue_index_of_object < self._queue_next_index:
                     for i in range(self._heap_next_index):
@@ -257,6 +312,13 @@ class FIFO_Dynamic_Prio():
         # Add the object to the heap with the new priority.
         self._heap_add(object, prio)
 
+        # Move the object to its new position in the service order. next_serve()
+        # ignores a heap top with priority 0, so such objects keep their FIFO position.
+        self._rank_remove(object)
+        if prio != 0:
+            self._rank_prio[object] = prio
+        self._rank_insert(object)
+
     def deprioritise_object(self, object):
         """
         Removes the priority of a queued object.
@@ -300,6 +362,97 @@ class FIFO_Dynamic_Prio():
             self._not_in_heap[self._not_in_heap_next_index] = object
             self._not_in_heap_next_index += 1
 
+        # Move the object back to its FIFO position in the service order.
+        self._rank_remove(object)
+        self._rank_insert(object)
+
+    def position_of(self, object):
+        """
+        Returns the rank of a queued object in service order in O(log n).
+
+        Rank 0 is the object that next_serve() returns. Prioritised objects come first,
+        ordered by descending priority and then by enqueue order, followed by the
+        unprioritised objects (including those with priority 0) in enqueue order.
+
+        Parameters:
+        ----------
+        object : any type
+            The object whose rank is requested.
+
+        Returns:
+        -------
+        int:
+            The rank of the object, or -1 if the object is not in the queue.
+        """
+
+        seq = self._rank_seq.get(object, 0)
+        if seq == 0:
+            return -1
+
+        # Prioritised objects are ranked among the heap keys.
+        if object in self._rank_prio:
+            return bisect.bisect_left(self._rank_heap_keys, (-self._rank_prio[object], seq))
+
+        # Unprioritised objects are served after every prioritised object.
+        return len(self._rank_heap_keys) + bisect.bisect_left(self._rank_fifo_keys, seq)
+
+    def estimated_wait(self, object):
+        """
+        Estimates the time until a queued object is served.
+
+        The estimate is (position_of(object) + 1) times the moving average of the
+        interval between two calls of serve().
+
+        Parameters:
+        ----------
+        object : any type
+            The object whose waiting time is estimated.
+
+        Returns:
+        -------
+        float or None:
+            The estimated waiting time in seconds, or None if the object is not in the
+            queue or fewer than two serves have been observed.
+        """
+
+        position = self.position_of(object)
+        if position == -1 or not self._serve_interval:
+            return None
+
+        return (position + 1) * self._serve_interval
+
+    def _rank_insert(self, object):
+        """
+        Inserts the key of a queued object into the order-statistic structures.
+        """
+
+        seq = self._rank_seq[object]
+        if object in self._rank_prio:
+            bisect.insort(self._rank_heap_keys, (-self._rank_prio[object], seq))
+        else:
+            bisect.insort(self._rank_fifo_keys, seq)
+
+    def _rank_remove(self, object):
+        """
+        Removes the key of an object from the order-statistic structures.
+        The object's priority is forgotten, its sequence number is kept.
+        """
+
+        seq = self._rank_seq.get(object, 0)
+        if seq == 0:
+            return
+
+        if object in self._rank_prio:
+            keys = self._rank_heap_keys
+            key = (-self._rank_prio.pop(object), seq)
+        else:
+            keys = self._rank_fifo_keys
+            key = seq
+
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
     def _heap_remove(self, index):
         """
         Removes an element from the heap at the specified index.
@@ -426,9 +579,9 @@ class FIFO_Dynamic_Prio():
                 parent_prio = self._heap[parent_index][1]
 
                 # Swap with the parent if the current node has a higher priority or the same priority but lower queue index.
-                if current_prio > parent_prio or (current_prio <= parent_prio and current_queue_idx < parent_queue_idx):
+                if current_prio > parent_prio or (current_prio == parent_prio and current_queue_idx < parent_queue_idx):
                     self._heap[current_index], self._heap[parent_index] = self._heap[parent_index], self._heap[current_index]
-                    self._recursive_calls_stack.append(parent_index)  # Re-check the parent index
+                    self._recursive_calls_stack[self._recursive_calls_stack_next_index] = parent_index  # Re-check the parent index
                     self._recursive_calls_stack_next_index += 1
 
             # Check the child nodes.
@@ -445,7 +598,7 @@ class FIFO_Dynamic_Prio():
                 if child1_queue_idx != 0 and (child1_prio > current_prio or (child1_prio == current_prio and child1_queue_idx < current_queue_idx)):
                     # Swap with the first child if necessary.
                     self._heap[current_index], self._heap[child1_index] = self._heap[child1_index], self._heap[current_index]
-                    self._recursive_calls_stack.append(child1_index)  # Re-check the child index
+                    self._recursive_calls_stack[self._recursive_calls_stack_next_index] = child1_index  # Re-check the child index
                     self._recursive_calls_stack_next_index += 1
 
             # Check the second child (right).
@@ -458,5 +611,5 @@ class FIFO_Dynamic_Prio():
                 if child2_queue_idx != 0 and (child2_prio > current_prio or (child2_prio == current_prio and child2_queue_idx < current_queue_idx)):
                     # Swap with the second child if necessary.
                     self._heap[current_index], self._heap[child2_index] = self._heap[child2_index], self._heap[current_index]
-                    self._recursive_calls_stack.append(child2_index)  # Re-check the child index
+                    self._recursive_calls_stack[self._recursive_calls_stack_next_index] = child2_index  # Re-check the child index
                     self._recursive_calls_stack_next_index += 1
\ No newline at end of file
@@ -0,0 +1,317 @@
+import asyncio
+import collections
+import time
+
+
+# A typed queue event. kind is one of the event kinds below, prio is only used by
+# "prioritise" events and object is ignored by "serve" events.
+Event = collections.namedtuple("Event", ["kind", "object", "prio"], defaults=[0, 1])
+
+ENQUEUE = "enqueue"
+PRIORITISE = "prioritise"
+DEPRIORITISE = "deprioritise"
+DEQUEUE = "dequeue"
+SERVE = "serve"
+
+
+class FIFO_Dynamic_Prio_Stream():
+    """
+    A streaming pipeline stage that applies a stream of queue events to a
+    FIFO_Dynamic_Prio (or any queue with the same methods) and yields the served objects.
+
+    Events are pulled from the source in micro-batches and applied with pre-bound
+    methods, which keeps the per-event overhead low. Serve events always serve one
+    object. In addition the serve policy can serve one object after every k events
+    or serve at a target rate. The rate is a token bucket that is checked at the end of
+    every micro-batch; it holds at most serve_burst objects of credit and earns none
+    while the queue is empty.
+
+    A micro-batch is processed as soon as it is full, contains a serve event or reaches
+    the next serve of the serve_every policy, so served objects are yielded without
+    waiting for further events. Async sources additionally flush a pending batch
+    max_latency seconds after its first event, and check the serve rate every
+    max_latency seconds while the source is idle.
+    """
+
+    def __init__(self, fifo, serve_every=0, serve_rate=0, batch_size=64, serve_burst=0, max_latency=0.1):
+        """
+        Initializes the FIFO_Dynamic_Prio_Stream object.
+
+        Parameters:
+        ----------
+        fifo : FIFO_Dynamic_Prio
+            The queue the events are applied to.
+        serve_every : int, optional
+            If set, one object is served after every serve_every events. Default is 0 (off).
+        serve_rate : float, optional
+            If set, objects are served at this target rate in objects per second.
+            Default is 0 (off).
+        serve_burst : float, optional
+            The maximum serve credit of the serve_rate policy, i.e. the most objects
+            served at once after a pause. Default is 0, meaning one second's worth of
+            serve_rate (at least one object).
+        batch_size : int, optional
+            The maximum number of events per micro-batch. Default is 64.
+        max_latency : float, optional
+            The time in seconds after its first event at which an async source flushes
+            a pending batch that is not yet ready. Default is 0.1.
+        """
+
+        self.fifo = fifo
+        self.serve_every = serve_every
+        self.serve_rate = serve_rate
+        self.serve_burst = serve_burst or max(1, serve_rate)
+        self.batch_size = max(1, batch_size)
+        self.max_latency = max_latency
+
+        # The queue methods the event kinds that only carry an object are dispatched to.
+        # Prioritise and serve events are handled separately.
+        self._dispatch = {
+            ENQUEUE: fifo.enqueue_object,
+            DEPRIORITISE: fifo.deprioritise_object,
+            DEQUEUE: fifo.dequeue_object,
+        }
+
+        # The number of events since the last serve of the serve_every policy.
+        self._events_since_serve = 0
+
+        # The serve credit of the serve_rate policy, the time it was last updated and
+        # whether the queue ran empty at that time.
+        self._clock = time.monotonic
+        self._serve_credit = 0
+        self._credit_time = 0
+        self._queue_was_empty = False
+
+        # Throughput counters.
+        self.events = 0
+        self.served = 0
+        self.batches = 0
+        self._start_time = 0
+
+    def process(self, events):
+        """
+        Consumes an iterable of events and yields the served objects.
+
+        Parameters:
+        ----------
+        events : iterable of Event
+            The events to apply to the queue.
+
+        Yields:
+        -------
+        object:
+            Every object served according to the serve policy.
+        """
+
+        batch = []
+        for event in events:
+            if not batch:
+                limit = self._batch_limit()
+            batch.append(event)
+            if len(batch) >= limit or event.kind == SERVE:
+                yield from self._process_batch(batch)
+                batch = []
+
+        if batch:
+            yield from self._process_batch(batch)
+
+    async def aprocess(self, events):
+        """
+        Consumes an async iterable of events and yields the served objects.
+
+        Parameters:
+        ----------
+        events : async iterable of Event
+            The events to apply to the queue.
+
+        Yields:
+        -------
+        object:
+            Every object served according to the serve policy.
+        """
+
+        loop = asyncio.get_running_loop()
+        clock = loop.time
+        max_latency = self.max_latency
+        batch_limit = self._batch_limit
+
+        # A reader task pulls the events with a plain async for and builds the
+        # micro-batches. It hands every ready batch over and pauses until the batch has
+        # been processed, so this generator only wakes up once per batch.
+        batch = []
+        limit = 0
+        deadline = 0
+        ready = []
+        resume = None
+        wakeup = None
+
+        def wake():
+            if wakeup is not None and not wakeup.done():
+                wakeup.set_result(None)
+
+        async def read():
+            nonlocal batch, limit, deadline, resume
+            try:
+                async for event in events:
+                    # The latency timer of a batch starts with its first event.
+                    if not batch:
+                        limit = batch_limit()
+                        deadline = clock() + max_latency
+                    batch.append(event)
+                    if len(batch) >= limit or event.kind == SERVE:
+                        ready.append(batch)
+                        batch = []
+                        resume = loop.create_future()
+                        wake()
+                        await resume
+            finally:
+                wake()
+
+        reader = asyncio.ensure_future(read())
+
+        try:
+            while True:
+                if ready:
+                    for object in self._process_batch(ready.pop()):
+                        yield object
+                    resume.set_result(None)
+                    continue
+
+                if reader.done():
+                    break
+
+                # Wait for the next ready batch. While the source is idle, a pending
+                # batch is flushed when its latency timer expires and the serve rate is
+                # checked every max_latency seconds.
+                if batch:
+                    timeout = deadline - clock()
+                elif self.serve_rate:
+                    timeout = max_latency
+                else:
+                    timeout = None
+
+                if timeout is None or timeout > 0:
+                    wakeup = loop.create_future()
+                    done, not_done = await asyncio.wait({wakeup}, timeout=timeout)
+                    if done or ready:
+                        continue
+
+                flushed, batch = batch, []
+                for object in self._process_batch(flushed):
+                    yield object
+
+            # Raise any exception of the source.
+            reader.result()
+        finally:
+            reader.cancel()
+
+        if batch:
+            for object in self._process_batch(batch):
+                yield object
+
+    def stats(self):
+        """
+        Returns the throughput counters.
+
+        Returns:
+        -------
+        dict:
+            The number of processed events, served objects and micro-batches, the time
+            since the first batch and the resulting events and served objects per second.
+        """
+
+        elapsed = self._clock() - self._start_time if self.batches else 0
+
+        return {
+            "events": self.events,
+            "served": self.served,
+            "batches": self.batches,
+            "elapsed": elapsed,
+            "events_per_second": self.events / elapsed if elapsed else 0,
+            "served_per_second": self.served / elapsed if elapsed else 0,
+        }
+
+    def _batch_limit(self):
+        """
+        Returns the length at which the next micro-batch has to be processed: when it
+        is full or when the serve_every policy serves with its last event. A batch is
+        also processed early when it ends with a serve event.
+        """
+
+        if self.serve_every:
+            return min(self.batch_size, self.serve_every - self._events_since_serve)
+        return self.batch_size
+
+    def _process_batch(self, batch):
+        """
+        Applies a micro-batch of events to the queue.
+
+        Returns:
+        -------
+        list:
+            The objects served while processing the batch, in serving order.
+        """
+
+        now = self._clock()
+        if not self.batches:
+            self._start_time = now
+            self._credit_time = now
+
+        # Local names avoid attribute lookups in the per-event loop.
+        dispatch = self._dispatch
+        prioritise = self.fifo.prioritise_object
+        serve = self.fifo.serve
+        serve_every = self.serve_every
+        events_since_serve = self._events_since_serve
+        served = []
+
+        for event in batch:
+            kind = event.kind
+            if kind == SERVE:
+                object = serve()
+                if object:
+                    served.append(object)
+            elif kind == PRIORITISE:
+                prioritise(event.object, event.prio)
+            else:
+                dispatch[kind](event.object)
+
+        # Batches end at the next serve of the serve_every policy at the latest, so
+        # the policy serves after the last event of the batch.
+        if serve_every:
+            events_since_serve += len(batch)
+            if events_since_serve >= serve_every:
+                events_since_serve = 0
+                object = serve()
+                if object:
+                    served.append(object)
+
+        self._events_since_serve = events_since_serve
+
+        # Serve the credit the target rate has accumulated since the last batch.
+        if self.serve_rate:
+            now = self._clock()
+
+            # No credit is earned for time in which the queue was empty, and the
+            # credit is capped so a pause does not turn into a burst.
+            if not self._queue_was_empty:
+                self._serve_credit = min(self.serve_burst, self._serve_credit + (now - self._credit_time) * self.serve_rate)
+            self._credit_time = now
+
+            while self._serve_credit >= 1:
+                object = serve()
+                if not object:
+                    self._serve_credit = 0
+                    break
+                served.append(object)
+                self._serve_credit -= 1
+
+            valid, next_object = self.fifo.next_serve()
+            self._queue_was_empty = not valid
+
+        self.events += len(batch)
+        self.served += len(served)
+        if batch:
+            self.batches += 1
+
+        return served
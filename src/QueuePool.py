@@ -0,0 +1,535 @@
+class QueuePool():
+    """
+    A class that hosts many logical FIFO queues with dynamic prioritization in one
+    shared arena of growable backing arrays.
+
+    Every queued object occupies one slot of the arena. The slots of a logical queue
+    are chained into a doubly linked list kept in service order (highest priority
+    first, then earliest enqueued), so the head of a queue is always its next object
+    to serve. Non-empty queues are additionally tracked in an indexed heap keyed by
+    their heads, which allows the globally best head to be found in O(log Q).
+
+    Memory therefore scales with the number of queued objects instead of the number
+    of queues times their capacity.
+
+    Note: Like FIFO_Dynamic_Prio this class is not optimized for Python and is
+    designed for universal implementation, particularly in low-level programming
+    environments.
+    """
+
+    def __init__(self, slot_capacity=16, queue_capacity=16):
+        """
+        Initializes the QueuePool object.
+
+        Parameters:
+        ----------
+        slot_capacity : int, optional
+            The initial number of slots in the shared arena. The arena doubles
+            its size whenever it runs out of free slots. Default is 16.
+        queue_capacity : int, optional
+            The initial number of logical queues the per-queue arrays can hold.
+            These arrays double in size whenever a new queue does not fit. Default is 16.
+        """
+
+        # The current number of slots in the arena.
+        self.slot_capacity = max(1, slot_capacity)
+
+        # The object stored in each slot (0 marks an empty slot).
+        self._slot_object = [0] * self.slot_capacity
+
+        # The priority of each slot (0 means the object is not prioritised).
+        self._slot_prio = [0] * self.slot_capacity
+
+        # The global enqueue sequence number of each slot, used for FIFO tie-breaking.
+        self._slot_seq = [0] * self.slot_capacity
+
+        # The previous and next slot in the linked list of the owning queue (-1 = none).
+        # For free slots _slot_next chains the free list.
+        self._slot_prev = [-1] * self.slot_capacity
+        self._slot_next = [i + 1 for i in range(self.slot_capacity)]
+        self._slot_next[self.slot_capacity - 1] = -1
+
+        # The first free slot of the arena (-1 if the arena is full).
+        self._free_head = 0
+
+        # The sequence number that will be given to the next enqueued object.
+        self._next_seq = 1
+
+        # The current number of logical queues the per-queue arrays can hold.
+        self.queue_capacity = max(1, queue_capacity)
+
+        # The number of logical queues created so far.
+        self._queue_count = 0
+
+        # The first and last slot of each logical queue (-1 if the queue is empty).
+        self._queue_head = [-1] * self.queue_capacity
+        self._queue_tail = [-1] * self.queue_capacity
+
+        # The number of objects in each logical queue.
+        self._queue_size = [0] * self.queue_capacity
+
+        # An indexed heap of the non-empty queues, ordered by their head slots.
+        self._global_heap = [0] * self.queue_capacity
+
+        # The index in _global_heap where the next queue will be inserted.
+        self._global_heap_next_index = 0
+
+        # The position of each queue in _global_heap (-1 if the queue is not in the heap).
+        self._global_heap_pos = [-1] * self.queue_capacity
+
+    def __str__(self):
+        """
+        Returns a string representation of every logical queue in service order,
+        followed by the globally next object to be served.
+        """
+        s = ""
+        for queue_id in range(self._queue_count):
+            s += f"queue {queue_id}: ["
+            slot = self._queue_head[queue_id]
+            while slot != -1:
+                s += f"[{self._slot_object[slot]}, {self._slot_prio[slot]}]"
+                slot = self._slot_next[slot]
+                if slot != -1:
+                    s += ", "
+            s += "], "
+
+        s += "next object: "
+
+        valid, queue_id, next_object = self.next_serve_global()
+        if valid:
+            s += f"{next_object} (queue {queue_id})"
+        else:
+            s += "___"
+
+        return s
+
+    def create_queue(self):
+        """
+        Creates a new, empty logical queue in the pool.
+
+        Returns:
+        -------
+        int:
+            The id of the new queue, to be passed to the per-queue methods.
+        """
+
+        # Grow the per-queue arrays if the new queue does not fit.
+        if self._queue_count == self.queue_capacity:
+            self._grow_queues()
+
+        queue_id = self._queue_count
+        self._queue_count += 1
+
+        return queue_id
+
+    def size(self, queue_id):
+        """
+        Returns the number of objects in a logical queue.
+
+        Parameters:
+        ----------
+        queue_id : int
+            The id of the queue.
+        """
+
+        return self._queue_size[queue_id]
+
+    def enqueue_object(self, queue_id, object):
+        """
+        Adds an object to the end of a logical queue.
+        Note: The prioritization of the object must be set separately after enqueuing.
+
+        Parameters:
+        ----------
+        queue_id : int
+            The id of the queue the object is added to.
+        object : any type
+            The object to be added to the queue and tracked.
+        """
+
+        # Take a slot from the free list, growing the arena if necessary.
+        if self._free_head == -1:
+            self._grow_slots()
+
+        slot = self._free_head
+        self._free_head = self._slot_next[slot]
+
+        # Fill the slot as an unprioritised object.
+        self._slot_object[slot] = object
+        self._slot_prio[slot] = 0
+        self._slot_seq[slot] = self._next_seq
+        self._next_seq += 1
+
+        # Link the slot into the queue and update the global heap if the head changed.
+        self._list_insert(queue_id, slot)
+        self._queue_size[queue_id] += 1
+        self._global_heap_update(queue_id)
+
+    def next_serve(self, queue_id):
+        """
+        Returns a tuple indicating if the next object of a logical queue can be served
+        and the object itself.
+
+        Parameters:
+        ----------
+        queue_id : int
+            The id of the queue.
+
+        Returns:
+        -------
+        tuple:
+            (bool, object):
+                A tuple where the first element indicates if a valid object is available,
+                and the second element is the object or 0 if no valid object is present.
+        """
+
+        slot = self._queue_head[queue_id]
+        if slot != -1:
+            return (True, self._slot_object[slot])
+
+        return (False, 0)
+
+    def serve(self, queue_id):
+        """
+        Serves the next object of a logical queue.
+
+        The object is removed from the queue after being served.
+
+        Parameters:
+        ----------
+        queue_id : int
+            The id of the queue.
+
+        Returns:
+        -------
+        object:
+            The object that has been served, or 0 if there was no valid object to serve.
+        """
+
+        slot = self._queue_head[queue_id]
+        if slot == -1:
+            return 0
+
+        next_object = self._slot_object[slot]
+        self._remove_slot(queue_id, slot)
+
+        return next_object
+
+    def next_serve_global(self):
+        """
+        Returns the globally best head across all logical queues.
+
+        The best head is the one with the highest priority and, for equal priorities,
+        the earliest enqueued one. Unprioritised objects count as priority 0.
+
+        Returns:
+        -------
+        tuple:
+            (bool, int, object):
+                A tuple where the first element indicates if a valid object is available,
+                the second element is the id of its queue (-1 if none) and the third
+                element is the object or 0 if no valid object is present.
+        """
+
+        if self._global_heap_next_index > 0:
+            queue_id = self._global_heap[0]
+            return (True, queue_id, self._slot_object[self._queue_head[queue_id]])
+
+        return (False, -1, 0)
+
+    def serve_global(self):
+        """
+        Serves the globally best head across all logical queues.
+
+        Returns:
+        -------
+        tuple:
+            (int, object):
+                The id of the queue the object was served from and the object,
+                or (-1, 0) if every queue is empty.
+        """
+
+        valid, queue_id, next_object = self.next_serve_global()
+        if valid:
+            self._remove_slot(queue_id, self._queue_head[queue_id])
+
+        return (queue_id, next_object)
+
+    def dequeue_object(self, queue_id, object):
+        """
+        Removes an object from a logical queue.
+
+        Parameters:
+        ----------
+        queue_id : int
+            The id of the queue.
+        object : any type
+            The object to be removed from the queue.
+        """
+
+        slot = self._find_slot(queue_id, object)
+        if slot != -1:
+            self._remove_slot(queue_id, slot)
+
+    def prioritise_object(self, queue_id, object, prio=1):
+        """
+        Assigns a priority to an object queued in a logical queue.
+
+        Parameters:
+        ----------
+        queue_id : int
+            The id of the queue.
+        object : any type
+            The object for which the priority is being set.
+        prio : int, optional
+            The priority level to assign to the object. Default is 1.
+        """
+
+        slot = self._find_slot(queue_id, object)
+
+        # If the object is not in the queue, do not prioritise it.
+        if slot == -1:
+            return
+
+        # Move the slot to its new position in service order.
+        self._list_unlink(queue_id, slot)
+        self._slot_prio[slot] = prio
+        self._list_insert(queue_id, slot)
+        self._global_heap_update(queue_id)
+
+    def deprioritise_object(self, queue_id, object):
+        """
+        Removes the priority of an object queued in a logical queue.
+        The object returns to its original FIFO position.
+
+        Parameters:
+        ----------
+        queue_id : int
+            The id of the queue.
+        object : any type
+            The object for which the priority is being removed.
+        """
+
+        slot = self._find_slot(queue_id, object)
+
+        # If the object is not in the queue, exit the method.
+        if slot == -1:
+            return
+
+        self._list_unlink(queue_id, slot)
+        self._slot_prio[slot] = 0
+        self._list_insert(queue_id, slot)
+        self._global_heap_update(queue_id)
+
+    def _find_slot(self, queue_id, object):
+        """
+        Returns the slot of an object in a logical queue or -1 if it is not queued.
+        The search only visits the slots of the given queue.
+        """
+
+        slot = self._queue_head[queue_id]
+        while slot != -1:
+            if self._slot_object[slot] == object:
+                return slot
+            slot = self._slot_next[slot]
+
+        return -1
+
+    def _remove_slot(self, queue_id, slot):
+        """
+        Unlinks a slot from its queue, returns it to the free list and
+        updates the global heap.
+        """
+
+        self._list_unlink(queue_id, slot)
+        self._queue_size[queue_id] -= 1
+
+        # Clear the slot and push it onto the free list.
+        self._slot_object[slot] = 0
+        self._slot_prio[slot] = 0
+        self._slot_seq[slot] = 0
+        self._slot_prev[slot] = -1
+        self._slot_next[slot] = self._free_head
+        self._free_head = slot
+
+        self._global_heap_update(queue_id)
+
+    def _slot_before(self, slot_a, slot_b):
+        """
+        Returns True if slot_a is served before slot_b, i.e. it has a higher
+        priority or the same priority and an earlier enqueue sequence number.
+        """
+
+        prio_a = self._slot_prio[slot_a]
+        prio_b = self._slot_prio[slot_b]
+
+        return prio_a > prio_b or (prio_a == prio_b and self._slot_seq[slot_a] < self._slot_seq[slot_b])
+
+    def _list_insert(self, queue_id, slot):
+        """
+        Links a slot into the list of a queue at its position in service order.
+
+        The search starts at the tail, so appending a newly enqueued object is O(1).
+        """
+
+        # Walk backwards from the tail until a slot is found that is served before the new one.
+        prev = self._queue_tail[queue_id]
+        while prev != -1 and self._slot_before(slot, prev):
+            prev = self._slot_prev[prev]
+
+        # Link the slot after prev (or at the head if prev is -1).
+        if prev == -1:
+            next = self._queue_head[queue_id]
+            self._queue_head[queue_id] = slot
+        else:
+            next = self._slot_next[prev]
+            self._slot_next[prev] = slot
+
+        if next == -1:
+            self._queue_tail[queue_id] = slot
+        else:
+            self._slot_prev[next] = slot
+
+        self._slot_prev[slot] = prev
+        self._slot_next[slot] = next
+
+    def _list_unlink(self, queue_id, slot):
+        """
+        Unlinks a slot from the list of a queue.
+        """
+
+        prev = self._slot_prev[slot]
+        next = self._slot_next[slot]
+
+        if prev == -1:
+            self._queue_head[queue_id] = next
+        else:
+            self._slot_next[prev] = next
+
+        if next == -1:
+            self._queue_tail[queue_id] = prev
+        else:
+            self._slot_prev[next] = prev
+
+        self._slot_prev[slot] = -1
+        self._slot_next[slot] = -1
+
+    def _grow_slots(self):
+        """
+        Doubles the size of the arena and chains the new slots into the free list.
+        """
+
+        old_capacity = self.slot_capacity
+        new_capacity = old_capacity * 2
+
+        self._slot_object += [0] * old_capacity
+        self._slot_prio += [0] * old_capacity
+        self._slot_seq += [0] * old_capacity
+        self._slot_prev += [-1] * old_capacity
+        self._slot_next += [i + 1 for i in range(old_capacity, new_capacity)]
+        self._slot_next[new_capacity - 1] = self._free_head
+
+        self._free_head = old_capacity
+        self.slot_capacity = new_capacity
+
+    def _grow_queues(self):
+        """
+        Doubles the size of the per-queue arrays.
+        """
+
+        old_capacity = self.queue_capacity
+
+        self._queue_head += [-1] * old_capacity
+        self._queue_tail += [-1] * old_capacity
+        self._queue_size += [0] * old_capacity
+        self._global_heap += [0] * old_capacity
+        self._global_heap_pos += [-1] * old_capacity
+
+        self.queue_capacity = old_capacity * 2
+
+    def _global_heap_update(self, queue_id):
+        """
+        Restores the position of a queue in the global heap after its head has changed.
+        Empty queues are removed from the heap, newly non-empty queues are added.
+        """
+
+        pos = self._global_heap_pos[queue_id]
+
+        if self._queue_head[queue_id] == -1:
+            # The queue became empty: replace it with the last element of the heap.
+            if pos != -1:
+                last = self._global_heap_next_index - 1
+                last_queue_id = self._global_heap[last]
+                self._global_heap[pos] = last_queue_id
+                self._global_heap_pos[last_queue_id] = pos
+                self._global_heap[last] = 0
+                self._global_heap_pos[queue_id] = -1
+                self._global_heap_next_index -= 1
+                if pos != last:
+                    self._global_heap_sift_up(pos)
+                    self._global_heap_sift_down(self._global_heap_pos[last_queue_id])
+            return
+
+        if pos == -1:
+            # The queue became non-empty: append it to the heap.
+            pos = self._global_heap_next_index
+            self._global_heap[pos] = queue_id
+            self._global_heap_pos[queue_id] = pos
+            self._global_heap_next_index += 1
+
+        self._global_heap_sift_up(pos)
+        self._global_heap_sift_down(self._global_heap_pos[queue_id])
+
+    def _global_heap_before(self, index_a, index_b):
+        """
+        Returns True if the head of the queue at heap index index_a is served
+        before the head of the queue at heap index index_b.
+        """
+
+        return self._slot_before(self._queue_head[self._global_heap[index_a]],
+                                 self._queue_head[self._global_heap[index_b]])
+
+    def _global_heap_swap(self, index_a, index_b):
+        """
+        Swaps two entries of the global heap and updates their positions.
+        """
+
+        queue_a = self._global_heap[index_a]
+        queue_b = self._global_heap[index_b]
+        self._global_heap[index_a] = queue_b
+        self._global_heap[index_b] = queue_a
+        self._global_heap_pos[queue_a] = index_b
+        self._global_heap_pos[queue_b] = index_a
+
+    def _global_heap_sift_up(self, index):
+        """
+        Moves an entry of the global heap up until its parent is served before it.
+        """
+
+        while index > 0:
+            parent_index = (index - 1) // 2
+            if not self._global_heap_before(index, parent_index):
+                break
+            self._global_heap_swap(index, parent_index)
+            index = parent_index
+
+    def _global_heap_sift_down(self, index):
+        """
+        Moves an entry of the global heap down until it is served before its children.
+        """
+
+        while True:
+            best_index = index
+            child1_index = index * 2 + 1
+            child2_index = index * 2 + 2
+
+            if child1_index < self._global_heap_next_index and self._global_heap_before(child1_index, best_index):
+                best_index = child1_index
+            if child2_index < self._global_heap_next_index and self._global_heap_before(child2_index, best_index):
+                best_index = child2_index
+
+            if best_index == index:
+                break
+
+            self._global_heap_swap(index, best_index)
+            index = best_index
@@ -0,0 +1,332 @@
+import itertools
+import random
+import threading
+
+from FIFO_Dynamic_Prio import FIFO_Dynamic_Prio
+
+
+class Sharded_FIFO_Dynamic_Prio():
+    """
+    A thread-safe FIFO queue with dynamic prioritization that partitions its objects
+    across K inner FIFO_Dynamic_Prio shards by key hash.
+
+    Every shard has its own lock, so producers working on different shards never wait
+    for each other. Each enqueued object receives a number from a global sequence
+    counter, which makes the heads of different shards comparable: the global head is
+    the one with the highest priority and, for equal priorities, the lowest sequence
+    number. In strict mode the shard heads are kept in a small tournament tree, which
+    producers only touch when the head of their shard changes. In relaxed mode there
+    is no tree; consumers serve the better head of two randomly chosen shards instead,
+    trading strict ordering for throughput.
+    """
+
+    def __init__(self, n, shards=4, relaxed=False, key=None):
+        """
+        Initializes the Sharded_FIFO_Dynamic_Prio object.
+
+        Parameters:
+        ----------
+        n : int
+            The maximum number of elements each shard will hold.
+        shards : int, optional
+            The number of inner queues (K). Default is 4.
+        relaxed : bool, optional
+            If True, serving only compares two random shard heads instead of
+            maintaining the global merge structure. Default is False.
+        key : callable, optional
+            A function mapping an object to the key that is hashed to choose its
+            shard. Default is the object itself.
+        """
+
+        # The maximum number of elements per shard and the number of shards.
+        self.n = n
+        self.shards = max(1, shards)
+
+        # Whether serving uses the relaxed two-choice strategy.
+        self.relaxed = relaxed
+
+        # The function mapping objects to their shard key.
+        self._key = key
+
+        # The inner queues and the lock protecting each of them.
+        self._shard_queue = [FIFO_Dynamic_Prio(n) for _ in range(self.shards)]
+        self._shard_lock = [threading.Lock() for _ in range(self.shards)]
+
+        # The global sequence number and the priority of every object, per shard.
+        self._shard_seq = [{} for _ in range(self.shards)]
+        self._shard_prio = [{} for _ in range(self.shards)]
+
+        # The global sequence counter used for FIFO tie-breaking across shards.
+        self._seq_counter = itertools.count(1)
+
+        # The key of each shard's head as published to the merge structure
+        # (a sequence number of 0 marks an empty shard).
+        self._head_prio = [0] * self.shards
+        self._head_seq = [0] * self.shards
+
+        # A tournament tree over the shard heads. Leaves live at [shards, 2 * shards),
+        # every inner node holds the winning shard of its children (-1 if all are empty)
+        # and the overall winner is found at index 1.
+        self._tree = [-1] * (2 * self.shards)
+
+        # The lock protecting _head_prio, _head_seq and _tree.
+        self._merge_lock = threading.Lock()
+
+    def __str__(self):
+        """
+        Returns a string representation of every shard and the next object to be served.
+        """
+        s = ""
+        for shard in range(self.shards):
+            with self._shard_lock[shard]:
+                s += f"shard {shard}: {{{self._shard_queue[shard]}}}, "
+
+        s += "next object: "
+
+        valid, next_object = self.next_serve()
+        if valid:
+            s += str(next_object)
+        else:
+            s += "___"
+
+        return s
+
+    def enqueue_object(self, object):
+        """
+        Adds an object to the queue of its shard.
+        Note: The prioritization of the object must be set separately after enqueuing.
+
+        Parameters:
+        ----------
+        object : any type
+            The object to be added to the queue and tracked.
+        """
+
+        shard = self._shard_of(object)
+        queue = self._shard_queue[shard]
+
+        with self._shard_lock[shard]:
+            # Like FIFO_Dynamic_Prio, a full shard silently ignores the object.
+            # Objects that are already queued keep their original sequence number.
+            if queue._queue_next_index < queue.n and object not in self._shard_seq[shard]:
+                queue.enqueue_object(object)
+                self._shard_seq[shard][object] = next(self._seq_counter)
+                self._publish_head(shard)
+
+    def prioritise_object(self, object, prio=1):
+        """
+        Assigns a priority to a queued object.
+
+        Parameters:
+        ----------
+        object : any type
+            The object for which the priority is being set.
+        prio : int, optional
+            The priority level to assign to the object. Default is 1.
+        """
+
+        shard = self._shard_of(object)
+
+        with self._shard_lock[shard]:
+            # If the object is not in the queue, do not prioritise it.
+            if object in self._shard_seq[shard]:
+                self._shard_queue[shard].prioritise_object(object, prio)
+                self._shard_prio[shard][object] = prio
+                self._publish_head(shard)
+
+    def deprioritise_object(self, object):
+        """
+        Removes the priority of a queued object.
+
+        Parameters:
+        ----------
+        object : any type
+            The object for which the priority is being removed.
+        """
+
+        shard = self._shard_of(object)
+
+        with self._shard_lock[shard]:
+            if object in self._shard_seq[shard]:
+                self._shard_queue[shard].deprioritise_object(object)
+                self._shard_prio[shard].pop(object, None)
+                self._publish_head(shard)
+
+    def dequeue_object(self, object):
+        """
+        Removes an object from the queue of its shard.
+
+        Parameters:
+        ----------
+        object : any type
+            The object to be removed from the queue.
+        """
+
+        shard = self._shard_of(object)
+
+        with self._shard_lock[shard]:
+            if object in self._shard_seq[shard]:
+                self._remove_object(shard, object)
+
+    def next_serve(self):
+        """
+        Returns a tuple indicating if the next object can be served and the object itself.
+
+        In relaxed mode the returned object is the better head of two random shards
+        and therefore not necessarily the global head.
+
+        Returns:
+        -------
+        tuple:
+            (bool, object):
+                A tuple where the first element indicates if a valid object is available,
+                and the second element is the object or 0 if no valid object is present.
+        """
+
+        shard, seq = self._choose_shard()
+        if shard == -1:
+            return (False, 0)
+
+        with self._shard_lock[shard]:
+            return self._shard_queue[shard].next_serve()
+
+    def serve(self):
+        """
+        Serves the next object from the queue.
+
+        In strict mode this is the object with the highest priority and, for equal
+        priorities, the earliest enqueued one across all shards.
+
+        Returns:
+        -------
+        object:
+            The object that has been served, or 0 if there was no valid object to serve.
+        """
+
+        while True:
+            shard, seq = self._choose_shard()
+            if shard == -1:
+                return 0
+
+            with self._shard_lock[shard]:
+                valid, next_object = self._shard_queue[shard].next_serve()
+                if not valid:
+                    # Another consumer emptied the shard in the meantime.
+                    continue
+
+                # In strict mode the chosen head may have been served and replaced by a
+                # worse one after the merge structure was read; try again in that case.
+                if not self.relaxed and self._shard_seq[shard][next_object] != seq:
+                    continue
+
+                self._remove_object(shard, next_object)
+                return next_object
+
+    def _shard_of(self, object):
+        """
+        Returns the shard an object belongs to.
+        """
+
+        key = object if self._key is None else self._key(object)
+        return hash(key) % self.shards
+
+    def _remove_object(self, shard, object):
+        """
+        Removes an object from a shard and publishes the new shard head.
+        The caller must hold the lock of the shard.
+        """
+
+        self._shard_queue[shard].dequeue_object(object)
+        del self._shard_seq[shard][object]
+        self._shard_prio[shard].pop(object, None)
+        self._publish_head(shard)
+
+    def _shard_head(self, shard):
+        """
+        Returns the (priority, sequence number) key of a shard's head, or (0, 0) if the
+        shard is empty. The caller must hold the lock of the shard.
+        """
+
+        valid, head = self._shard_queue[shard].next_serve()
+        if not valid:
+            return (0, 0)
+
+        return (self._shard_prio[shard].get(head, 0), self._shard_seq[shard][head])
+
+    def _publish_head(self, shard):
+        """
+        Updates the merge structure if the head of a shard has changed.
+        The caller must hold the lock of the shard.
+        """
+
+        # Relaxed mode reads the shard heads directly and keeps no merge structure.
+        if self.relaxed:
+            return
+
+        prio, seq = self._shard_head(shard)
+
+        # Most enqueues append behind an existing head and never take the merge lock.
+        if prio == self._head_prio[shard] and seq == self._head_seq[shard]:
+            return
+
+        with self._merge_lock:
+            self._head_prio[shard] = prio
+            self._head_seq[shard] = seq
+
+            # Replay the tournament from the shard's leaf up to the root.
+            index = shard + self.shards
+            self._tree[index] = shard if seq != 0 else -1
+            index //= 2
+            while index > 0:
+                self._tree[index] = self._tree_winner(self._tree[2 * index], self._tree[2 * index + 1])
+                index //= 2
+
+    def _tree_winner(self, shard_a, shard_b):
+        """
+        Returns the shard whose published head is served first (-1 if both are empty).
+        """
+
+        if shard_a == -1:
+            return shard_b
+        if shard_b == -1:
+            return shard_a
+
+        prio_a = self._head_prio[shard_a]
+        prio_b = self._head_prio[shard_b]
+
+        if prio_a > prio_b or (prio_a == prio_b and self._head_seq[shard_a] < self._head_seq[shard_b]):
+            return shard_a
+
+        return shard_b
+
+    def _choose_shard(self):
+        """
+        Returns the shard to serve from and the sequence number of its head,
+        or (-1, 0) if there is nothing to serve.
+
+        In strict mode this is the winner of the tournament tree. In relaxed mode
+        it is the better of two randomly chosen non-empty shards.
+        """
+
+        if not self.relaxed:
+            with self._merge_lock:
+                shard = self._tree[1]
+                return (shard, self._head_seq[shard] if shard != -1 else 0)
+
+        best_shard = -1
+        best_prio = 0
+        best_seq = 0
+
+        # Sample two shards; fall back to a full scan if both happen to be empty.
+        candidates = [random.randrange(self.shards), random.randrange(self.shards)]
+        for attempt in range(2):
+            for shard in candidates:
+                with self._shard_lock[shard]:
+                    prio, seq = self._shard_head(shard)
+                if seq != 0 and (best_shard == -1 or prio > best_prio or (prio == best_prio and seq < best_seq)):
+                    best_shard, best_prio, best_seq = shard, prio, seq
+            if best_shard != -1:
+                break
+            candidates = range(self.shards)
+
+        return (best_shard, best_seq)
@@ -0,0 +1,474 @@
+import collections
+import heapq
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import tempfile
+
+
+class Spilling_FIFO_Dynamic_Prio():
+    """
+    A FIFO queue with dynamic prioritization whose cold tail is spilled to disk.
+
+    Only the hot head of the FIFO and the heap of prioritised objects are kept in RAM.
+    Once the hot head is full, further unprioritised objects are appended to
+    append-only segment files, and an on-disk key index (a SQLite table) records which
+    of them are still queued. Segments are read through memory maps and paged into the
+    hot head sequentially as the head advances; fully consumed segments are deleted.
+    Prioritising a cold object promotes it straight into the heap via the key index,
+    without reading its segment.
+
+    Objects must be picklable and are identified by their pickled form, so equal
+    objects have to pickle to the same bytes (as strings and integers do).
+    """
+
+    # The header of every segment record: enqueue sequence number and payload length.
+    _RECORD_HEADER = struct.Struct("<QI")
+
+    def __init__(self, hot_capacity, directory, segment_size=64 * 1024 * 1024):
+        """
+        Initializes the Spilling_FIFO_Dynamic_Prio object.
+
+        Parameters:
+        ----------
+        hot_capacity : int
+            The number of unprioritised objects kept in RAM at the head of the queue.
+            Deprioritising objects may exceed it temporarily.
+        directory : str
+            The existing directory in which the queue creates its own private spill
+            directory for the segment files and the key index. Several queues, or a
+            queue and the leftovers of an unclosed one, can share it safely.
+        segment_size : int, optional
+            The size in bytes after which a new segment file is started. Default is 64 MiB.
+        """
+
+        # The number of unprioritised objects kept in RAM.
+        self.hot_capacity = max(1, hot_capacity)
+
+        # The parent directory, the private spill directory inside it and the segment size.
+        # A fresh spill directory keeps stale segments and indexes of earlier instances
+        # out of the way.
+        self.directory = directory
+        self._spill_directory = tempfile.mkdtemp(prefix="spill_", dir=directory)
+        self.segment_size = segment_size
+
+        # The hot head of the FIFO: unprioritised objects in enqueue order.
+        self._hot = collections.deque()
+
+        # The enqueue sequence number of every object held in RAM (hot head and heap).
+        self._seq_of = {}
+
+        # The sequence number that will be given to the next enqueued object.
+        self._next_seq = 1
+
+        # A heap of [-priority, sequence number, push id, object] entries. Entries that
+        # no longer match _prio_of are stale and are discarded lazily, or all at once
+        # when they outnumber the live entries.
+        self._heap = []
+        self._prio_of = {}
+        self._next_push_id = 1
+
+        # Objects promoted from the cold tail whose segment record may still lie ahead
+        # of the reader.
+        self._from_cold = set()
+
+        # The on-disk key index of the live cold objects: pickled object -> sequence number.
+        self._index = sqlite3.connect(os.path.join(self._spill_directory, "index.sqlite"))
+        self._index.execute("PRAGMA journal_mode = OFF")
+        self._index.execute("PRAGMA synchronous = OFF")
+        self._index.execute("CREATE TABLE cold (key BLOB PRIMARY KEY, seq INTEGER) WITHOUT ROWID")
+
+        # The number of live cold objects.
+        self._cold_count = 0
+
+        # The segment that is appended to, its file and the current size of that file.
+        self._write_segment = 0
+        self._write_file = None
+        self._write_offset = 0
+
+        # The segment that is paged in, its memory map and the read position in it.
+        self._read_segment = 0
+        self._read_map = None
+        self._read_offset = 0
+
+        # The sequence number of the last record the reader has passed. Cold objects
+        # with a larger sequence number have not been paged in yet.
+        self._cold_paged_seq = 0
+
+    def __str__(self):
+        """
+        Returns a string representation of the hot head, the heap, the number of cold
+        objects and the next object to be served.
+        """
+        s = "hot: ["
+        s += ", ".join(str(element) for element in self._hot)
+        s += "], heap: ["
+        s += ", ".join(f"[{object}, {prio}]" for object, (prio, push_id) in self._prio_of.items())
+        s += f"], cold: {self._cold_count}, next object: "
+
+        valid, next_object = self.next_serve()
+        if valid:
+            s += str(next_object)
+        else:
+            s += "___"
+
+        return s
+
+    def enqueue_object(self, object):
+        """
+        Adds an object to the queue, spilling it to disk if the hot head is full.
+        Note: The prioritization of the object must be set separately after enqueuing.
+
+        Parameters:
+        ----------
+        object : any type
+            The object to be added to the queue and tracked.
+        """
+
+        # Objects that are already queued keep their position.
+        if object in self._seq_of:
+            return
+
+        seq = self._next_seq
+
+        # The hot head may only grow while nothing is waiting on disk behind it.
+        if self._cold_count == 0 and len(self._hot) < self.hot_capacity:
+            self._hot.append(object)
+            self._seq_of[object] = seq
+            self._next_seq += 1
+            return
+
+        key = pickle.dumps(object)
+        cursor = self._index.execute("INSERT OR IGNORE INTO cold (key, seq) VALUES (?, ?)", (key, seq))
+        if cursor.rowcount == 0:
+            return  # Already queued in the cold tail.
+
+        self._segment_append(seq, key)
+        self._cold_count += 1
+        self._next_seq += 1
+
+    def next_serve(self):
+        """
+        Returns a tuple indicating if the next object can be served and the object itself.
+
+        Returns:
+        -------
+        tuple:
+            (bool, object):
+                A tuple where the first element indicates if a valid object is available,
+                and the second element is the object or 0 if no valid object is present.
+        """
+
+        # Prioritised objects are served first.
+        self._heap_discard_stale()
+        if self._heap:
+            return (True, self._heap[0][3])
+
+        # Then the hot head, paging in the next objects from disk if it ran empty.
+        if not self._hot:
+            self._page_in()
+        if self._hot:
+            return (True, self._hot[0])
+
+        return (False, 0)
+
+    def serve(self):
+        """
+        Serves the next object with the highest priority from the queue.
+
+        The object is removed from the queue after being served.
+
+        Returns:
+        -------
+        object:
+            The object that has been served, or 0 if there was no valid object to serve.
+        """
+
+        valid, next_object = self.next_serve()
+        if valid:
+            self.dequeue_object(next_object)
+
+        return next_object
+
+    def dequeue_object(self, object):
+        """
+        Removes an object from the queue, wherever it is held.
+
+        Parameters:
+        ----------
+        object : any type
+            The object to be removed from the queue.
+        """
+
+        if object in self._prio_of:
+            # The heap entry becomes stale and is discarded lazily.
+            del self._prio_of[object]
+            del self._seq_of[object]
+            self._from_cold.discard(object)
+        elif object in self._seq_of:
+            if self._hot[0] == object:
+                self._hot.popleft()
+            else:
+                self._hot.remove(object)
+            del self._seq_of[object]
+        else:
+            # Deleting the index entry turns the segment record into a tombstone.
+            self._cold_remove(pickle.dumps(object))
+
+    def prioritise_object(self, object, prio=1):
+        """
+        Assigns a priority to a queued object, promoting it from disk if necessary.
+
+        Parameters:
+        ----------
+        object : any type
+            The object for which the priority is being set.
+        prio : int, optional
+            The priority level to assign to the object. Default is 1.
+        """
+
+        if object in self._prio_of:
+            pass  # Already in the heap, only the priority changes.
+        elif object in self._seq_of:
+            self._hot.remove(object)
+        else:
+            # Look the object up in the on-disk key index.
+            seq = self._cold_remove(pickle.dumps(object))
+
+            # If the object is not in the queue, do not prioritise it.
+            if seq == 0:
+                return
+
+            self._seq_of[object] = seq
+            self._from_cold.add(object)
+
+        self._heap_push(object, prio)
+
+    def deprioritise_object(self, object):
+        """
+        Removes the priority of a queued object.
+        The object returns to its original FIFO position, on disk if the reader has
+        not passed that position yet.
+
+        Parameters:
+        ----------
+        object : any type
+            The object for which the priority is being removed.
+        """
+
+        # Only prioritised objects are affected.
+        if object not in self._prio_of:
+            return
+
+        del self._prio_of[object]
+        seq = self._seq_of[object]
+
+        if object in self._from_cold:
+            self._from_cold.discard(object)
+            if seq > self._cold_paged_seq:
+                # The segment record is still ahead of the reader: revive it.
+                del self._seq_of[object]
+                self._index.execute("INSERT INTO cold (key, seq) VALUES (?, ?)", (pickle.dumps(object), seq))
+                self._cold_count += 1
+                return
+
+        # Insert the object into the hot head at its position in enqueue order.
+        index = len(self._hot)
+        while index > 0 and self._seq_of[self._hot[index - 1]] > seq:
+            index -= 1
+        self._hot.insert(index, object)
+
+    def close(self):
+        """
+        Closes the key index and the segment files and deletes them together with the
+        private spill directory. The queue must not be used afterwards.
+        """
+
+        self._cold_reset()
+        self._index.close()
+        os.remove(os.path.join(self._spill_directory, "index.sqlite"))
+        os.rmdir(self._spill_directory)
+
+    def _heap_push(self, object, prio):
+        """
+        Pushes a new heap entry for an object; any older entry becomes stale.
+        The heap is rebuilt from the live entries once it is more than twice their number.
+        """
+
+        push_id = self._next_push_id
+        self._next_push_id += 1
+
+        self._prio_of[object] = (prio, push_id)
+        heapq.heappush(self._heap, [-prio, self._seq_of[object], push_id, object])
+
+        # Stale entries below the top are never popped, so drop them in one O(n) pass.
+        # The small constant keeps tiny heaps from being rebuilt on every push.
+        if len(self._heap) > 2 * len(self._prio_of) + 16:
+            self._heap = [[-prio, self._seq_of[object], push_id, object]
+                          for object, (prio, push_id) in self._prio_of.items()]
+            heapq.heapify(self._heap)
+
+    def _heap_discard_stale(self):
+        """
+        Pops stale entries from the top of the heap.
+        """
+
+        while self._heap:
+            prio, seq, push_id, object = self._heap[0]
+            if self._prio_of.get(object) == (-prio, push_id):
+                break
+            heapq.heappop(self._heap)
+
+    def _cold_remove(self, key):
+        """
+        Removes a pickled object from the key index.
+
+        Returns:
+        -------
+        int:
+            The sequence number of the removed object, or 0 if it was not a live cold object.
+        """
+
+        row = self._index.execute("SELECT seq FROM cold WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return 0
+
+        self._index.execute("DELETE FROM cold WHERE key = ?", (key,))
+        self._cold_count -= 1
+
+        # Without live cold objects the remaining records are all tombstones.
+        if self._cold_count == 0:
+            self._cold_reset()
+
+        return row[0]
+
+    def _cold_reset(self):
+        """
+        Drops every segment once no live cold object is left and moves the reader
+        past all records written so far.
+        """
+
+        if self._read_map is not None:
+            self._read_map.close()
+            self._read_map = None
+        if self._write_file is not None:
+            self._write_file.close()
+            self._write_file = None
+
+        for segment in range(self._read_segment, self._write_segment + 1):
+            path = self._segment_path(segment)
+            if os.path.exists(path):
+                os.remove(path)
+
+        self._write_segment += 1
+        self._write_offset = 0
+        self._read_segment = self._write_segment
+        self._read_offset = 0
+        self._cold_paged_seq = self._next_seq - 1
+
+    def _segment_path(self, segment):
+        """
+        Returns the path of a segment file.
+        """
+
+        return os.path.join(self._spill_directory, f"segment_{segment:08d}.seg")
+
+    def _segment_append(self, seq, payload):
+        """
+        Appends a record to the current write segment, starting a new segment once
+        the current one has reached segment_size.
+        """
+
+        if self._write_file is not None and self._write_offset >= self.segment_size:
+            self._write_file.close()
+            self._write_file = None
+            self._write_segment += 1
+            self._write_offset = 0
+
+        if self._write_file is None:
+            self._write_file = open(self._segment_path(self._write_segment), "ab")
+
+        self._write_file.write(self._RECORD_HEADER.pack(seq, len(payload)))
+        self._write_file.write(payload)
+        self._write_offset += self._RECORD_HEADER.size + len(payload)
+
+    def _segment_read(self):
+        """
+        Reads the next record from the segments.
+
+        Returns:
+        -------
+        tuple or None:
+            (sequence number, payload) of the next record, or None if the reader has
+            caught up with the writer.
+        """
+
+        while True:
+            # Read from the current memory map while it has unread bytes.
+            if self._read_map is not None and self._read_offset < len(self._read_map):
+                seq, length = self._RECORD_HEADER.unpack_from(self._read_map, self._read_offset)
+                start = self._read_offset + self._RECORD_HEADER.size
+                self._read_offset = start + length
+                return (seq, self._read_map[start:self._read_offset])
+
+            # Determine how large the read segment is by now.
+            if self._read_segment == self._write_segment:
+                if self._write_file is None:
+                    return None
+                self._write_file.flush()
+                size = self._write_offset
+            else:
+                size = os.path.getsize(self._segment_path(self._read_segment))
+
+            mapped_size = len(self._read_map) if self._read_map is not None else 0
+
+            if size > mapped_size:
+                # The segment has grown since it was mapped: map it again.
+                if self._read_map is not None:
+                    self._read_map.close()
+                with open(self._segment_path(self._read_segment), "rb") as segment_file:
+                    self._read_map = mmap.mmap(segment_file.fileno(), size, access=mmap.ACCESS_READ)
+            elif self._read_segment < self._write_segment:
+                # The segment is fully consumed: delete it and continue with the next one.
+                if self._read_map is not None:
+                    self._read_map.close()
+                    self._read_map = None
+                os.remove(self._segment_path(self._read_segment))
+                self._read_segment += 1
+                self._read_offset = 0
+            else:
+                return None
+
+    def _page_in(self):
+        """
+        Moves live cold objects into the hot head in enqueue order until it is full,
+        skipping the tombstones of dequeued and promoted objects.
+        """
+
+        if self._cold_count == 0:
+            return
+
+        while self._cold_count > 0 and len(self._hot) < self.hot_capacity:
+            record = self._segment_read()
+            if record is None:
+                break
+
+            seq, key = record
+            self._cold_paged_seq = seq
+
+            # The record is only live if the index still holds it with this sequence number.
+            row = self._index.execute("SELECT seq FROM cold WHERE key = ?", (key,)).fetchone()
+            if row is None or row[0] != seq:
+                continue
+
+            self._index.execute("DELETE FROM cold WHERE key = ?", (key,))
+            self._cold_count -= 1
+
+            object = pickle.loads(key)
+            self._hot.append(object)
+            self._seq_of[object] = seq
+
+        if self._cold_count == 0:
+            self._cold_reset()
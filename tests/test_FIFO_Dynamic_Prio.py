@@ -203,6 +203,72 @@ class TestFIFO_Dynamic_Prio(unittest.TestCase):
         self.assertTrue(valid)
         self.assertEqual(next_serve, "MC2")  # Expecting MC2 to be served due to higher priority
 
+    def test_serving_order_with_deep_heap(self):
+        """Test that serving order respects priorities once the heap is more than two levels deep."""
+        fifo = FIFO_Dynamic_Prio(8)
+        for i in range(1, 9):
+            fifo.enqueue_object(f"MC{i}")
+        for i, prio in zip(range(1, 9), [1, 5, 2, 2, 7, 1, 3, 5]):
+            fifo.prioritise_object(f"MC{i}", prio)
+        served = [fifo.serve() for _ in range(8)]
+        self.assertEqual(served, ["MC5", "MC2", "MC8", "MC7", "MC3", "MC4", "MC1", "MC6"])
+
+    def test_position_of(self):
+        """Test that position_of returns the rank in service order."""
+        self.fifo.enqueue_object("MC1")
+        self.fifo.enqueue_object("MC2")
+        self.fifo.enqueue_object("MC3")
+        self.fifo.enqueue_object("MC4")
+        self.fifo.prioritise_object("MC3", 1)
+        self.fifo.prioritise_object("MC4", 2)
+        self.assertEqual([self.fifo.position_of(f"MC{i}") for i in range(1, 5)], [2, 3, 1, 0])
+        self.assertEqual(self.fifo.position_of("MC5"), -1)  # Not queued
+
+        self.fifo.deprioritise_object("MC4")
+        self.fifo.dequeue_object("MC1")
+        self.assertEqual([self.fifo.position_of(f"MC{i}") for i in range(1, 5)], [-1, 1, 0, 2])
+
+    def test_position_of_matches_serving_order(self):
+        """Test that the ranks of all objects match the order in which they are served."""
+        for i in range(1, 6):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.fifo.prioritise_object("MC1", 0)  # Priority 0 keeps the FIFO position
+        for i, prio in zip(range(2, 5), [3, 1, 3]):
+            self.fifo.prioritise_object(f"MC{i}", prio)
+        ranked = sorted((self.fifo.position_of(f"MC{i}"), f"MC{i}") for i in range(1, 6))
+        served = [self.fifo.serve() for _ in range(5)]
+        self.assertEqual([object for rank, object in ranked], served)
+        self.assertEqual(served, ["MC2", "MC4", "MC3", "MC1", "MC5"])
+
+    def test_duplicate_enqueue(self):
+        """Test that enqueuing a queued object again neither duplicates it nor breaks its rank."""
+        self.fifo.enqueue_object("MC1")
+        self.fifo.enqueue_object("MC2")
+        self.fifo.enqueue_object("MC1")  # Already queued, ignored
+        self.assertEqual(self.fifo._queue_next_index, 2)
+        self.assertEqual(self.fifo.position_of("MC2"), 1)
+
+        self.assertEqual(self.fifo.serve(), "MC1")
+        self.assertEqual(self.fifo.position_of("MC1"), -1)
+        self.assertEqual(self.fifo.position_of("MC2"), 0)
+        self.assertEqual(self.fifo.serve(), "MC2")
+        self.assertEqual(self.fifo.next_serve(), (False, 0))
+
+    def test_estimated_wait(self):
+        """Test that the estimated wait uses the moving average of the serve interval."""
+        clock = iter([10.0, 12.0, 16.0])
+        self.fifo._clock = lambda: next(clock)
+        for i in range(1, 6):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.assertIsNone(self.fifo.estimated_wait("MC5"))  # No serve rate yet
+
+        self.fifo.serve()
+        self.fifo.serve()
+        self.assertEqual(self.fifo.estimated_wait("MC4"), 2 * 2.0)
+        self.fifo.serve()
+        self.assertAlmostEqual(self.fifo.estimated_wait("MC5"), 2 * (2.0 + 0.2 * (4.0 - 2.0)))
+        self.assertIsNone(self.fifo.estimated_wait("MC1"))  # Already served
+
     def tearDown(self):
         """Clean up after each test if necessary."""
         pass
@@ -0,0 +1,174 @@
+import unittest
+import sys
+import os
+import asyncio
+import time
+
+# Add the src directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from FIFO_Dynamic_Prio import FIFO_Dynamic_Prio
+from FIFO_Dynamic_Prio_Stream import FIFO_Dynamic_Prio_Stream, Event, ENQUEUE, PRIORITISE, DEPRIORITISE, DEQUEUE, SERVE
+
+class TestFIFO_Dynamic_Prio_Stream(unittest.TestCase):
+
+    def setUp(self):
+        """Create a new FIFO_Dynamic_Prio instance before each test."""
+        self.fifo = FIFO_Dynamic_Prio(5)
+
+    def test_serve_on_demand(self):
+        """Test that serve events serve objects in priority order."""
+        stream = FIFO_Dynamic_Prio_Stream(self.fifo, batch_size=2)
+        events = [
+            Event(ENQUEUE, "MC1"),
+            Event(ENQUEUE, "MC2"),
+            Event(ENQUEUE, "MC3"),
+            Event(PRIORITISE, "MC3", 2),
+            Event(PRIORITISE, "MC2", 1),
+            Event(DEPRIORITISE, "MC2"),
+            Event(SERVE),
+            Event(DEQUEUE, "MC1"),
+            Event(SERVE),
+            Event(SERVE),  # Nothing left to serve
+        ]
+        self.assertEqual(list(stream.process(events)), ["MC3", "MC2"])
+        stats = stream.stats()
+        self.assertEqual(stats["events"], 10)
+        self.assertEqual(stats["served"], 2)
+        self.assertEqual(stats["batches"], 6)  # Every serve event closes its batch
+
+    def test_serve_every_k_events(self):
+        """Test that the serve_every policy serves after every k events across batches."""
+        stream = FIFO_Dynamic_Prio_Stream(self.fifo, serve_every=3, batch_size=4)
+        events = [Event(ENQUEUE, f"MC{i}") for i in range(1, 6)]
+        events.insert(4, Event(PRIORITISE, "MC4", 1))
+        self.assertEqual(list(stream.process(events)), ["MC1", "MC4"])
+
+    def test_serve_rate(self):
+        """Test that the serve_rate policy serves the accumulated credit after each batch."""
+        stream = FIFO_Dynamic_Prio_Stream(self.fifo, serve_rate=2, batch_size=2)
+        clock = iter([0.0, 0.0, 0.5, 1.0, 1.0, 1.5])
+        stream._clock = lambda: next(clock)
+        events = [Event(ENQUEUE, f"MC{i}") for i in range(1, 6)]
+        served = list(stream.process(events))
+        # Batch 1 ends at 0.0 s (no credit), batch 2 at 1.0 s (credit 2), batch 3 at 1.5 s (credit 1)
+        self.assertEqual(served, ["MC1", "MC2", "MC3"])
+
+    def test_serve_rate_caps_credit(self):
+        """Test that a pause between batches does not turn into a burst of serves."""
+        fifo = FIFO_Dynamic_Prio(100)
+        stream = FIFO_Dynamic_Prio_Stream(fifo, serve_rate=1, batch_size=50)
+        clock = iter([0.0, 0.0, 3600.0, 3600.0])
+        stream._clock = lambda: next(clock)
+        events = [Event(ENQUEUE, f"MC{i}") for i in range(1, 101)]
+        served = list(stream.process(events))
+        self.assertEqual(served, ["MC1"])  # One second's worth of credit at most
+
+    def test_serve_rate_no_credit_while_empty(self):
+        """Test that no credit is earned while the queue is empty."""
+        stream = FIFO_Dynamic_Prio_Stream(self.fifo, serve_rate=1, serve_burst=5, batch_size=1)
+        clock = iter([0.0, 0.0, 1.0, 10.0, 10.0, 11.0])
+        stream._clock = lambda: next(clock)
+        events = [Event(DEQUEUE, "MC0"), Event(ENQUEUE, "MC1"), Event(ENQUEUE, "MC2")]
+        served = list(stream.process(events))
+        # The queue is empty until the check at 10.0 s, so only the second up to 11.0 s earns credit
+        self.assertEqual(served, ["MC1"])
+
+    def test_async_source(self):
+        """Test that an async iterable of events is processed like a sync one."""
+        stream = FIFO_Dynamic_Prio_Stream(self.fifo, batch_size=3)
+
+        async def events():
+            for i in range(1, 4):
+                yield Event(ENQUEUE, f"MC{i}")
+            yield Event(PRIORITISE, "MC2", 1)
+            yield Event(SERVE)
+            yield Event(SERVE)
+
+        async def collect():
+            return [object async for object in stream.aprocess(events())]
+
+        self.assertEqual(asyncio.run(collect()), ["MC2", "MC1"])
+        self.assertEqual(stream.stats()["batches"], 3)
+
+    def test_serve_event_flushes_batch(self):
+        """Test that a served object is yielded without waiting for further events."""
+        stream = FIFO_Dynamic_Prio_Stream(self.fifo)
+
+        def events():
+            yield Event(ENQUEUE, "MC1")
+            yield Event(SERVE)
+            raise AssertionError("The stream read past the serve event")
+
+        self.assertEqual(next(stream.process(events())), "MC1")
+
+    def test_async_serve_event_with_idle_source(self):
+        """Test that an async source that pauses after a serve event still delivers the object."""
+        stream = FIFO_Dynamic_Prio_Stream(self.fifo)
+
+        async def events():
+            yield Event(ENQUEUE, "MC1")
+            yield Event(SERVE)
+            await asyncio.sleep(3600)
+
+        async def first():
+            served = stream.aprocess(events())
+            try:
+                return await asyncio.wait_for(served.__anext__(), 1)
+            finally:
+                await served.aclose()
+
+        self.assertEqual(asyncio.run(first()), "MC1")
+
+    def test_async_max_latency_with_serve_rate(self):
+        """Test that an idle async source still gets its events applied and served at the target rate."""
+        stream = FIFO_Dynamic_Prio_Stream(self.fifo, serve_rate=100, max_latency=0.05)
+
+        async def events():
+            yield Event(ENQUEUE, "MC1")
+            yield Event(ENQUEUE, "MC2")
+            await asyncio.sleep(3600)
+
+        async def first_two():
+            served = stream.aprocess(events())
+            try:
+                return [await asyncio.wait_for(served.__anext__(), 1) for _ in range(2)]
+            finally:
+                await served.aclose()
+
+        self.assertEqual(asyncio.run(first_two()), ["MC1", "MC2"])
+        self.assertEqual(stream.stats()["batches"], 1)
+
+    def test_async_overhead(self):
+        """Test that aprocess costs at most about one extra plain async for loop per event."""
+        events = [Event(ENQUEUE, f"MC{i}") for i in range(1, 20001)]
+
+        async def source():
+            for event in events:
+                yield event
+
+        async def plain():
+            fifo = FIFO_Dynamic_Prio(len(events))
+            start = time.perf_counter()
+            async for event in source():
+                fifo.enqueue_object(event.object)
+            return time.perf_counter() - start
+
+        async def streamed():
+            stream = FIFO_Dynamic_Prio_Stream(FIFO_Dynamic_Prio(len(events)))
+            start = time.perf_counter()
+            async for object in stream.aprocess(source()):
+                pass
+            return time.perf_counter() - start
+
+        # The best of several runs keeps the comparison robust against noisy machines.
+        plain_time = min(asyncio.run(plain()) for _ in range(5))
+        streamed_time = min(asyncio.run(streamed()) for _ in range(5))
+        self.assertLess(streamed_time, 3 * plain_time)
+
+    def tearDown(self):
+        """Clean up after each test if necessary."""
+        pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from QueuePool import QueuePool
+
+class TestQueuePool(unittest.TestCase):
+
+    def setUp(self):
+        """Create a new QueuePool instance with two queues before each test."""
+        self.pool = QueuePool(slot_capacity=2, queue_capacity=1)
+        self.q1 = self.pool.create_queue()
+        self.q2 = self.pool.create_queue()
+
+    def test_serve_empty(self):
+        """Test serving when nothing is queued."""
+        valid, next_serve = self.pool.next_serve(self.q1)
+        self.assertFalse(valid)
+        valid, queue_id, next_serve = self.pool.next_serve_global()
+        self.assertFalse(valid)
+        self.assertEqual(self.pool.serve_global(), (-1, 0))
+
+    def test_enqueue_multiple(self):
+        """Test that each queue serves its own objects in FIFO order."""
+        self.pool.enqueue_object(self.q1, "MC1")
+        self.pool.enqueue_object(self.q2, "MC2")
+        self.pool.enqueue_object(self.q1, "MC3")
+        self.assertEqual(self.pool.size(self.q1), 2)
+        self.assertEqual(self.pool.serve(self.q1), "MC1")
+        self.assertEqual(self.pool.serve(self.q1), "MC3")
+        self.assertEqual(self.pool.serve(self.q1), 0)
+        self.assertEqual(self.pool.serve(self.q2), "MC2")
+
+    def test_arena_grows(self):
+        """Test that the shared arena and queue arrays grow on demand."""
+        queues = [self.q1, self.q2] + [self.pool.create_queue() for _ in range(10)]
+        for i, queue_id in enumerate(queues):
+            self.pool.enqueue_object(queue_id, f"MC{i}")
+            self.pool.enqueue_object(queue_id, f"MD{i}")
+        self.assertGreaterEqual(self.pool.slot_capacity, 24)
+        for i, queue_id in enumerate(queues):
+            self.assertEqual(self.pool.serve(queue_id), f"MC{i}")
+            self.assertEqual(self.pool.serve(queue_id), f"MD{i}")
+
+    def test_prioritise_and_deprioritise(self):
+        """Test that priorities reorder a queue and deprioritising restores FIFO order."""
+        self.pool.enqueue_object(self.q1, "MC1")
+        self.pool.enqueue_object(self.q1, "MC2")
+        self.pool.enqueue_object(self.q1, "MC3")
+        self.pool.prioritise_object(self.q1, "MC3", 2)
+        self.pool.prioritise_object(self.q1, "MC2", 1)
+        self.assertEqual(self.pool.next_serve(self.q1), (True, "MC3"))
+        self.pool.deprioritise_object(self.q1, "MC3")
+        self.assertEqual(self.pool.serve(self.q1), "MC2")
+        self.assertEqual(self.pool.serve(self.q1), "MC1")
+        self.assertEqual(self.pool.serve(self.q1), "MC3")
+
+    def test_prioritise_nonexistent_object(self):
+        """Test that prioritising an object of another queue has no effect."""
+        self.pool.enqueue_object(self.q1, "MC1")
+        self.pool.enqueue_object(self.q2, "MC2")
+        self.pool.prioritise_object(self.q1, "MC2", 5)
+        self.assertEqual(self.pool.next_serve_global(), (True, self.q1, "MC1"))
+
+    def test_dequeue(self):
+        """Test dequeuing objects from the middle and head of a queue."""
+        self.pool.enqueue_object(self.q1, "MC1")
+        self.pool.enqueue_object(self.q1, "MC2")
+        self.pool.enqueue_object(self.q1, "MC3")
+        self.pool.dequeue_object(self.q1, "MC2")
+        self.pool.dequeue_object(self.q1, "MC1")
+        self.pool.dequeue_object(self.q1, "MC4")
+        self.assertEqual(self.pool.size(self.q1), 1)
+        self.assertEqual(self.pool.next_serve(self.q1), (True, "MC3"))
+
+    def test_global_serving_order(self):
+        """Test that the global head respects priority, then enqueue order across queues."""
+        q3 = self.pool.create_queue()
+        self.pool.enqueue_object(self.q1, "MC1")
+        self.pool.enqueue_object(self.q2, "MC2")
+        self.pool.enqueue_object(q3, "MC3")
+        self.pool.enqueue_object(self.q1, "MC4")
+        self.pool.prioritise_object(q3, "MC3", 2)
+        self.pool.prioritise_object(self.q1, "MC4", 2)
+        self.assertEqual(self.pool.serve_global(), (q3, "MC3"))
+        self.assertEqual(self.pool.serve_global(), (self.q1, "MC4"))
+        self.assertEqual(self.pool.serve_global(), (self.q1, "MC1"))
+        self.assertEqual(self.pool.serve_global(), (self.q2, "MC2"))
+        self.assertEqual(self.pool.serve_global(), (-1, 0))
+
+    def test_global_order_matches_reference(self):
+        """Test the global heap against a brute-force reference on a fixed workload."""
+        queues = [self.q1, self.q2] + [self.pool.create_queue() for _ in range(6)]
+        reference = []
+        seq = 0
+        for i in range(40):
+            queue_id = queues[(i * 7) % len(queues)]
+            self.pool.enqueue_object(queue_id, f"MC{i}")
+            prio = (i * 5) % 4
+            if prio:
+                self.pool.prioritise_object(queue_id, f"MC{i}", prio)
+            reference.append((-prio, seq, queue_id, f"MC{i}"))
+            seq += 1
+        for expected in sorted(reference):
+            self.assertEqual(self.pool.serve_global(), (expected[2], expected[3]))
+
+    def tearDown(self):
+        """Clean up after each test if necessary."""
+        pass
+
+if __name__ == '__main__':
+    unittest.main()
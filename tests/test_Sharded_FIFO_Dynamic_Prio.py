@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add the src directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from Sharded_FIFO_Dynamic_Prio import Sharded_FIFO_Dynamic_Prio
+
+class TestSharded_FIFO_Dynamic_Prio(unittest.TestCase):
+
+    def setUp(self):
+        """Create a new Sharded_FIFO_Dynamic_Prio instance before each test."""
+        self.fifo = Sharded_FIFO_Dynamic_Prio(8, shards=3, key=lambda object: int(object[2:]))
+
+    def test_serve(self):
+        """Test serving when nothing is queued."""
+        valid, next_serve = self.fifo.next_serve()
+        self.assertFalse(valid)
+        self.assertEqual(self.fifo.serve(), 0)
+
+    def test_enqueue_multiple(self):
+        """Test that objects on different shards are served in global enqueue order."""
+        for i in [5, 1, 3, 2, 4]:
+            self.fifo.enqueue_object(f"MC{i}")
+        served = [self.fifo.serve() for _ in range(5)]
+        self.assertEqual(served, ["MC5", "MC1", "MC3", "MC2", "MC4"])
+
+    def test_prioritise_across_shards(self):
+        """Test that the highest priority wins across shards, ties in enqueue order."""
+        for i in range(1, 7):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.fifo.prioritise_object("MC6", 2)
+        self.fifo.prioritise_object("MC4", 2)
+        self.fifo.prioritise_object("MC2", 1)
+        self.fifo.prioritise_object("MC9", 5)  # Not queued, should be ignored
+        self.assertEqual(self.fifo.next_serve(), (True, "MC4"))
+        served = [self.fifo.serve() for _ in range(6)]
+        self.assertEqual(served, ["MC4", "MC6", "MC2", "MC1", "MC3", "MC5"])
+
+    def test_deprioritise_and_dequeue(self):
+        """Test that deprioritising and dequeuing update the global head."""
+        self.fifo.enqueue_object("MC1")
+        self.fifo.enqueue_object("MC2")
+        self.fifo.enqueue_object("MC3")
+        self.fifo.prioritise_object("MC3", 3)
+        self.fifo.prioritise_object("MC2", 2)
+        self.fifo.deprioritise_object("MC3")
+        self.assertEqual(self.fifo.next_serve(), (True, "MC2"))
+        self.fifo.dequeue_object("MC2")
+        self.fifo.dequeue_object("MC1")
+        self.assertEqual(self.fifo.next_serve(), (True, "MC3"))
+
+    def test_relaxed_serves_everything(self):
+        """Test that relaxed mode serves every object exactly once."""
+        fifo = Sharded_FIFO_Dynamic_Prio(20, shards=4, relaxed=True)
+        for i in range(20):
+            fifo.enqueue_object(f"MC{i}")
+        served = [fifo.serve() for _ in range(20)]
+        self.assertEqual(sorted(served), sorted(f"MC{i}" for i in range(20)))
+        self.assertEqual(fifo.serve(), 0)
+
+    def test_concurrent_producers_and_consumers(self):
+        """Test that concurrent producers and consumers neither lose nor duplicate objects."""
+        fifo = Sharded_FIFO_Dynamic_Prio(800, shards=4)
+        served = []
+        served_lock = threading.Lock()
+
+        def produce(offset):
+            for i in range(200):
+                fifo.enqueue_object(f"MC{offset + i}")
+                if i % 3 == 0:
+                    fifo.prioritise_object(f"MC{offset + i}", i % 5 + 1)
+
+        def consume():
+            for _ in range(200):
+                object = fifo.serve()
+                if object:
+                    with served_lock:
+                        served.append(object)
+
+        threads = [threading.Thread(target=produce, args=(offset,)) for offset in (0, 1000, 2000, 3000)]
+        threads += [threading.Thread(target=consume) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        object = fifo.serve()
+        while object:
+            served.append(object)
+            object = fifo.serve()
+
+        self.assertEqual(len(served), 800)
+        self.assertEqual(len(set(served)), 800)
+
+    def tearDown(self):
+        """Clean up after each test if necessary."""
+        pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the src directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from Spilling_FIFO_Dynamic_Prio import Spilling_FIFO_Dynamic_Prio
+
+class TestSpilling_FIFO_Dynamic_Prio(unittest.TestCase):
+
+    def setUp(self):
+        """Create a new Spilling_FIFO_Dynamic_Prio instance with a tiny hot head and segments."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.fifo = Spilling_FIFO_Dynamic_Prio(2, self.directory.name, segment_size=32)
+
+    def test_serve(self):
+        """Test serving when nothing is queued."""
+        valid, next_serve = self.fifo.next_serve()
+        self.assertFalse(valid)
+        self.assertEqual(self.fifo.serve(), 0)
+
+    def test_spill_and_page_in(self):
+        """Test that spilled objects are paged in and served in FIFO order."""
+        for i in range(1, 11):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.assertEqual(len(self.fifo._hot), 2)
+        self.assertEqual(self.fifo._cold_count, 8)
+        self.assertGreater(len(os.listdir(self.fifo._spill_directory)), 2)  # Index and several segments
+        served = [self.fifo.serve() for _ in range(10)]
+        self.assertEqual(served, [f"MC{i}" for i in range(1, 11)])
+        self.assertEqual(os.listdir(self.fifo._spill_directory), ["index.sqlite"])  # Segments are dropped
+
+    def test_enqueue_duplicate(self):
+        """Test that enqueuing a queued object again does not change its position."""
+        for i in range(1, 5):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.fifo.enqueue_object("MC1")
+        self.fifo.enqueue_object("MC4")
+        served = [self.fifo.serve() for _ in range(5)]
+        self.assertEqual(served, ["MC1", "MC2", "MC3", "MC4", 0])
+
+    def test_prioritise_promotes_from_disk(self):
+        """Test that prioritising a cold object promotes it ahead of the hot head."""
+        for i in range(1, 8):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.fifo.prioritise_object("MC6", 2)
+        self.fifo.prioritise_object("MC5", 2)
+        self.fifo.prioritise_object("MC9", 5)  # Not queued, should be ignored
+        served = [self.fifo.serve() for _ in range(7)]
+        self.assertEqual(served, ["MC5", "MC6", "MC1", "MC2", "MC3", "MC4", "MC7"])
+
+    def test_deprioritise_returns_to_disk(self):
+        """Test that a deprioritised object returns to its FIFO position on disk."""
+        for i in range(1, 8):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.fifo.prioritise_object("MC5", 1)
+        self.fifo.deprioritise_object("MC5")
+        self.assertEqual(self.fifo._cold_count, 5)
+        served = [self.fifo.serve() for _ in range(7)]
+        self.assertEqual(served, [f"MC{i}" for i in range(1, 8)])
+
+    def test_deprioritise_after_reader_passed(self):
+        """Test that a deprioritised object returns to the hot head once the reader passed its record."""
+        for i in range(1, 6):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.fifo.prioritise_object("MC3", 1)
+        self.fifo.prioritise_object("MC4", 1)
+        self.fifo.prioritise_object("MC5", 1)  # No cold object left, the reader skips to the end
+        self.fifo.deprioritise_object("MC4")
+        self.fifo.enqueue_object("MC6")
+        served = [self.fifo.serve() for _ in range(6)]
+        self.assertEqual(served, ["MC3", "MC5", "MC1", "MC2", "MC4", "MC6"])
+
+    def test_dequeue_cold_object(self):
+        """Test that dequeuing a cold object leaves a tombstone that is skipped."""
+        for i in range(1, 7):
+            self.fifo.enqueue_object(f"MC{i}")
+        self.fifo.dequeue_object("MC4")
+        self.fifo.dequeue_object("MC1")
+        served = [self.fifo.serve() for _ in range(5)]
+        self.assertEqual(served, ["MC2", "MC3", "MC5", "MC6", 0])
+
+    def test_reprioritise_keeps_heap_bounded(self):
+        """Test that stale heap entries of reprioritised objects do not pile up."""
+        for i in range(1, 5):
+            self.fifo.enqueue_object(f"MC{i}")
+        for i in range(1000):
+            self.fifo.prioritise_object("MC2", i % 5 + 1)
+            self.fifo.prioritise_object("MC3", i % 7 + 1)
+        self.assertLessEqual(len(self.fifo._heap), 2 * 2 + 16)
+
+        self.fifo.prioritise_object("MC3", 9)
+        served = [self.fifo.serve() for _ in range(4)]
+        self.assertEqual(served, ["MC3", "MC2", "MC1", "MC4"])
+
+    def test_reuse_directory_after_unclosed_instance(self):
+        """Test that a directory left behind by an unclosed instance can be reused."""
+        for i in range(5):
+            self.fifo.enqueue_object(f"a{i}")  # Never served, as after a crash
+
+        fifo = Spilling_FIFO_Dynamic_Prio(1, self.directory.name, segment_size=32)
+        for i in range(5):
+            fifo.enqueue_object(f"b{i}")
+        served = [fifo.serve() for _ in range(6)]
+        self.assertEqual(served, ["b0", "b1", "b2", "b3", "b4", 0])
+        fifo.close()
+
+        self.assertEqual(self.fifo.serve(), "a0")  # The first instance is unaffected
+
+    def test_close_removes_spill_directory(self):
+        """Test that closing a queue leaves the parent directory as it was."""
+        fifo = Spilling_FIFO_Dynamic_Prio(1, self.directory.name)
+        fifo.enqueue_object("MC1")
+        fifo.enqueue_object("MC2")
+        fifo.close()
+        self.assertEqual(os.listdir(self.directory.name), [os.path.basename(self.fifo._spill_directory)])
+
+    def tearDown(self):
+        """Close the queue and remove the spill directory."""
+        self.fifo.close()
+        self.directory.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
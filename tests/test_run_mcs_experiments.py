@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import copy
+
+# Add the examples directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../examples')))
+
+from run_mcs_experiments import empty_summary, merge_summaries, quantiles, run_experiments, simulate
+
+class TestRunMcsExperiments(unittest.TestCase):
+
+    def setUp(self):
+        """Create a small configuration before each test."""
+        # (machines, prio distribution, arrival rate, service rate, steps, starvation limit, seed)
+        self.config = (5, "skewed", 0.2, 0.5, 500, 10, 7)
+
+    def test_quantiles_empty(self):
+        """Test that an empty histogram has no quantiles."""
+        self.assertEqual(quantiles({}, [0.5, 0.9]), [None, None])
+
+    def test_quantiles_single_value(self):
+        """Test that every quantile of a single value is that value."""
+        self.assertEqual(quantiles({4: 3}, [0.0, 0.5, 1.0]), [4, 4, 4])
+
+    def test_quantiles_exact_cut_points(self):
+        """Test that a quantile falling exactly on a cumulative boundary takes the lower value."""
+        histogram = {1: 5, 2: 4, 3: 1}
+        self.assertEqual(quantiles(histogram, [0.5, 0.51, 0.9, 0.91, 1.0]), [1, 2, 2, 3, 3])
+
+    def test_merge_associative(self):
+        """Test that the merge result does not depend on the grouping of the summaries."""
+        summaries = [simulate(self.config[:6] + (seed,))[1] for seed in range(3)]
+
+        left = empty_summary()
+        merge_summaries(left, summaries[0])
+        merge_summaries(left, summaries[1])
+        merge_summaries(left, summaries[2])
+
+        right_inner = copy.deepcopy(summaries[1])
+        merge_summaries(right_inner, summaries[2])
+        right = copy.deepcopy(summaries[0])
+        merge_summaries(right, right_inner)
+
+        self.assertEqual(left, right)
+        self.assertEqual(left["runs"], 3)
+
+    def test_simulate_deterministic(self):
+        """Test that the same seed and configuration give an identical summary."""
+        key, summary = simulate(self.config)
+        self.assertEqual(key, (5, "skewed", 0.2, 0.5))
+        self.assertEqual(simulate(self.config), (key, summary))
+        self.assertEqual(sum(summary["queue_lengths"].values()), 500)
+
+    def test_starved_unserved(self):
+        """Test that machines still waiting beyond the limit at the end are counted."""
+        key, summary = simulate((10, "none", 0.5, 0.05, 300, 20, 1))
+        self.assertGreater(summary["starved_unserved"], 0)
+
+    def test_workers_do_not_change_results(self):
+        """Test that the merged results are the same for one and two worker processes."""
+        args = ([3, 5], ["none", "uniform"], [0.2], [0.5], 2, 300, 10, 0)
+        self.assertEqual(run_experiments(*args, workers=1), run_experiments(*args, workers=2))
+
+    def test_extending_sweep_keeps_results(self):
+        """Test that the runs of a configuration do not depend on the rest of the sweep."""
+        alone = run_experiments([5], ["uniform"], [0.2], [0.5], 2, 300, 10, 0, workers=1)
+        extended = run_experiments([3, 5], ["none", "uniform"], [0.2], [0.5], 2, 300, 10, 0, workers=1)
+        key = (5, "uniform", 0.2, 0.5)
+        self.assertEqual(alone[key], extended[key])
+
+    def test_base_seeds_do_not_share_runs(self):
+        """Test that the second run of base seed 0 is not the first run of base seed 1."""
+        key = (5, "uniform", 0.2, 0.5)
+        args = ([5], ["uniform"], [0.2], [0.5])
+        two_runs = run_experiments(*args, 2, 300, 10, 0, workers=1)[key]
+        shifted = run_experiments(*args, 1, 300, 10, 0, workers=1)[key]
+        merge_summaries(shifted, run_experiments(*args, 1, 300, 10, 1, workers=1)[key])
+        self.assertNotEqual(two_runs, shifted)
+
+    def tearDown(self):
+        """Clean up after each test if necessary."""
+        pass
+
+if __name__ == '__main__':
+    unittest.main()